@@ -0,0 +1,531 @@
+import json
+import os
+import random
+import shutil
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+import click
+
+from pheval_ai_marrvel.benchmark import stand_in
+from pheval_ai_marrvel.benchmark.stand_in import PROFILE_ENVIRONMENT_VARIABLE, StandInProfile
+
+STAND_IN_IMAGE = "pheval-ai-marrvel-stand-in"
+STAND_IN_DOCKERFILE = """FROM python:3.11-slim
+COPY stand_in.py /run/stand_in.py
+RUN printf '#!/bin/sh\\nexec python /run/stand_in.py proc "$@"\\n' > /run/proc.sh \\
+    && chmod +x /run/proc.sh
+ARG PROFILE={}
+ENV AI_MARRVEL_STAND_IN_PROFILE=$PROFILE
+"""
+BGZF_BLOCK_SIZE = 65280
+HPO_IDS = ["HP:0001250", "HP:0001263", "HP:0000252", "HP:0001290", "HP:0004322", "HP:0000750"]
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Orchestration cost of running a corpus with the stand-in executor.
+
+    Attributes:
+        environment (str): Environment AI-MARRVEL was run in, i.e., apptainer/docker/nextflow.
+        samples (int): Number of samples in the corpus.
+        concurrency (int): Number of samples run concurrently.
+        work_duration (float): Duration of the work done by the stand-in per sample in seconds.
+        setup_time (float): Time spent by the run stage outside of running the samples in seconds,
+            i.e., validating the inputs, creating the commands, deduplicating workloads and
+            writing the results index and run report, summed over the shards.
+        wall_time (float): Time to run the corpus in seconds.
+        succeeded (int): Number of samples that succeeded.
+        per_sample_setup_time (float): Setup time per sample in seconds.
+        per_sample_overhead (float): Mean runtime of a sample in excess of the work duration.
+        throughput (float): Samples run per second.
+        speedup (Optional[float]): Throughput relative to running the corpus serially.
+    """
+
+    environment: str
+    samples: int
+    concurrency: int
+    work_duration: float
+    setup_time: float
+    wall_time: float
+    succeeded: int
+    per_sample_setup_time: float
+    per_sample_overhead: float
+    throughput: float
+    speedup: Optional[float] = None
+
+
+def write_bgzf(path: Path, data: bytes) -> None:
+    """
+    Write data to a bgzip compressed file.
+
+    Args:
+        path (Path): Path to the file.
+        data (bytes): The data to compress.
+    """
+    from pheval_ai_marrvel.validate.validate_inputs import BGZF_EOF
+
+    with open(path, "wb") as bgzf_file:
+        for offset in range(0, len(data), BGZF_BLOCK_SIZE):
+            block = data[offset : offset + BGZF_BLOCK_SIZE]
+            compressor = zlib.compressobj(wbits=-15)
+            compressed = compressor.compress(block) + compressor.flush()
+            bgzf_file.write(
+                b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00"
+                + struct.pack("<H", len(compressed) + 25)
+                + compressed
+                + struct.pack("<II", zlib.crc32(block), len(block))
+            )
+        bgzf_file.write(BGZF_EOF)
+    bgzf_file.close()
+
+
+def create_synthetic_vcf(vcf_path: Path, variants: int, seed: int) -> None:
+    """
+    Write a synthetic bgzip compressed VCF file.
+
+    Args:
+        vcf_path (Path): Path to the VCF file.
+        variants (int): Number of variant records.
+        seed (int): Seed of the random variants.
+    """
+    rng = random.Random(seed)
+    lines = [
+        "##fileformat=VCFv4.2",
+        '##INFO=<ID=GENE,Number=1,Type=String,Description="Gene symbol">',
+        "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO",
+    ]
+    for chrom, pos in sorted(
+        (rng.randint(1, 22), rng.randint(10000, 50000000)) for _ in range(variants)
+    ):
+        ref, alt = rng.sample("ACGT", 2)
+        lines.append(f"{chrom}\t{pos}\t.\t{ref}\t{alt}\t50\tPASS\tGENE=GENE{rng.randint(1, 500)}")
+    write_bgzf(vcf_path, ("\n".join(lines) + "\n").encode())
+
+
+def create_synthetic_corpus(testdata_dir: Path, samples: int, variants: int = 1000) -> None:
+    """
+    Create a synthetic corpus of phenopackets, VCF files and HPO txt files.
+
+    Args:
+        testdata_dir (Path): Path to the test data directory.
+        samples (int): Number of samples.
+        variants (int): Number of variants in the VCF file of each sample.
+    """
+    from google.protobuf.json_format import MessageToJson
+    from phenopackets import (
+        File,
+        Individual,
+        MetaData,
+        OntologyClass,
+        Phenopacket,
+        PhenotypicFeature,
+    )
+
+    from pheval_ai_marrvel.prepare.prepare_input import write_input_txt_files
+
+    for subdirectory in ["phenopackets", "vcf", "hpo_ids"]:
+        testdata_dir.joinpath(subdirectory).mkdir(parents=True, exist_ok=True)
+    for sample in range(samples):
+        sample_id = f"sample_{sample:05d}"
+        vcf_path = testdata_dir.joinpath(f"vcf/{sample_id}.vcf.gz")
+        create_synthetic_vcf(vcf_path, variants, sample)
+        phenopacket = Phenopacket(
+            id=sample_id,
+            subject=Individual(id=sample_id),
+            phenotypic_features=[
+                PhenotypicFeature(type=OntologyClass(id=hpo_id))
+                for hpo_id in random.Random(sample).sample(HPO_IDS, 3)
+            ],
+            files=[
+                File(
+                    uri=str(vcf_path),
+                    file_attributes={"fileFormat": "vcf", "genomeAssembly": "GRCh38"},
+                )
+            ],
+            meta_data=MetaData(created_by="pheval-ai-marrvel benchmark"),
+        )
+        testdata_dir.joinpath(f"phenopackets/{sample_id}.json").write_text(
+            MessageToJson(phenopacket)
+        )
+    write_input_txt_files(testdata_dir)
+
+
+def install_shims(bin_dir: Path) -> None:
+    """
+    Install apptainer and nextflow executables running the stand-in in place of AI-MARRVEL.
+
+    Args:
+        bin_dir (Path): Directory to install the executables to.
+    """
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    for executable in ["apptainer", "nextflow"]:
+        shim_path = bin_dir.joinpath(executable)
+        shim_path.write_text(
+            f'#!/bin/sh\nexec "{sys.executable}" "{stand_in.__file__}" {executable} "$@"\n'
+        )
+        shim_path.chmod(0o755)
+
+
+@contextmanager
+def stand_in_environment(bin_dir: Path, profile: StandInProfile) -> Iterator[None]:
+    """
+    Put the stand-in executables first on the PATH and set the stand-in profile.
+
+    Args:
+        bin_dir (Path): Directory the stand-in executables are installed to.
+        profile (StandInProfile): The stand-in profile.
+    """
+    environment = os.environ.copy()
+    install_shims(bin_dir)
+    os.environ["PATH"] = f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+    os.environ[PROFILE_ENVIRONMENT_VARIABLE] = profile.to_json()
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(environment)
+
+
+def build_stand_in_image(profile: StandInProfile) -> str:
+    """
+    Build a local container image running the stand-in as /run/proc.sh.
+
+    Args:
+        profile (StandInProfile): The stand-in profile.
+
+    Returns:
+        str: The image tag.
+    """
+    import docker
+
+    with tempfile.TemporaryDirectory() as build_dir:
+        shutil.copy(stand_in.__file__, Path(build_dir).joinpath("stand_in.py"))
+        Path(build_dir).joinpath("Dockerfile").write_text(STAND_IN_DOCKERFILE)
+        docker.from_env().images.build(
+            path=build_dir, tag=STAND_IN_IMAGE, buildargs={"PROFILE": profile.to_json()}, rm=True
+        )
+    return STAND_IN_IMAGE
+
+
+def create_shard(testdata_dir: Path, shard_dir: Path, phenopacket_paths: List[Path]) -> None:
+    """
+    Create a test data directory for a shard of a corpus, linking to the phenopackets,
+    HPO txt files and VCF files of the corpus.
+
+    Args:
+        testdata_dir (Path): Path to the test data directory of the corpus.
+        shard_dir (Path): Path to the test data directory of the shard.
+        phenopacket_paths (List[Path]): The phenopacket paths of the shard.
+    """
+    for subdirectory in ["phenopackets", "hpo_ids"]:
+        shard_dir.joinpath(subdirectory).mkdir(parents=True, exist_ok=True)
+    shard_dir.joinpath("vcf").symlink_to(testdata_dir.joinpath("vcf").absolute())
+    for phenopacket_path in phenopacket_paths:
+        shard_dir.joinpath(f"phenopackets/{phenopacket_path.name}").symlink_to(
+            phenopacket_path.absolute()
+        )
+        shard_dir.joinpath(f"hpo_ids/{phenopacket_path.stem}.txt").symlink_to(
+            testdata_dir.joinpath(f"hpo_ids/{phenopacket_path.stem}.txt").absolute()
+        )
+
+
+def run_shard(environment: str, shard_dir: Path, run_dir: Path) -> Tuple[float, dict]:
+    """
+    Run a shard of a corpus through the run stage.
+
+    Args:
+        environment (str): Environment to run AI-MARRVEL, i.e., apptainer/docker/nextflow.
+        shard_dir (Path): Path to the test data directory of the shard.
+        run_dir (Path): Directory for the inputs, outputs and commands of the shard.
+
+    Returns:
+        Tuple[float, dict]: The time to run the shard in seconds and its run report.
+    """
+    from pheval_ai_marrvel.run.retry_policy import RetryPolicy
+    from pheval_ai_marrvel.run.run import run_commands
+
+    input_dir, output_dir, tool_input_commands_dir = (
+        run_dir.joinpath("input_dir"),
+        run_dir.joinpath("raw_results"),
+        run_dir.joinpath("tool_input_commands"),
+    )
+    for directory in [input_dir, output_dir, tool_input_commands_dir]:
+        directory.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    run_commands(
+        tool_input_commands_dir,
+        shard_dir,
+        input_dir,
+        output_dir,
+        environment,
+        retry_policy=RetryPolicy(max_retries=0),
+        image=STAND_IN_IMAGE,
+    )
+    shard_time = time.perf_counter() - start
+    with open(tool_input_commands_dir.joinpath(f"{shard_dir.name}_run_report.json")) as report_file:
+        run_report = json.load(report_file)
+    report_file.close()
+    return shard_time, run_report
+
+
+def benchmark_environment(
+    environment: str,
+    testdata_dir: Path,
+    run_dir: Path,
+    concurrency: int,
+    profile: StandInProfile,
+) -> BenchmarkResult:
+    """
+    Run a corpus with the stand-in executor and measure the orchestration cost.
+
+    The run stage runs samples serially, concurrency is emulated by splitting the corpus into
+    shards run independently through the run stage, as when a corpus is split across array jobs.
+
+    Args:
+        environment (str): Environment to run AI-MARRVEL, i.e., apptainer/docker/nextflow.
+        testdata_dir (Path): Path to the test data directory.
+        run_dir (Path): Directory for the shards and their inputs, outputs and commands.
+        concurrency (int): Number of samples run concurrently.
+        profile (StandInProfile): The stand-in profile.
+
+    Returns:
+        BenchmarkResult: The orchestration cost.
+    """
+    from pheval.utils.file_utils import all_files
+
+    phenopacket_paths = sorted(all_files(testdata_dir.joinpath("phenopackets")))
+    shards = []
+    for shard in range(concurrency):
+        if phenopacket_paths[shard::concurrency]:
+            shard_dir = run_dir.joinpath(f"shard_{shard}")
+            create_shard(testdata_dir, shard_dir, phenopacket_paths[shard::concurrency])
+            shards.append(shard_dir)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        shard_runs = list(
+            executor.map(
+                lambda shard_dir: run_shard(
+                    environment, shard_dir, run_dir.joinpath(f"{shard_dir.name}_run")
+                ),
+                shards,
+            )
+        )
+    wall_time = time.perf_counter() - start
+    samples = [sample for _, run_report in shard_runs for sample in run_report["samples"]]
+    setup_time = sum(
+        shard_time
+        - sum(
+            attempt["duration"]
+            for sample in run_report["samples"]
+            for attempt in sample["attempts"]
+        )
+        for shard_time, run_report in shard_runs
+    )
+    durations = [
+        attempt["duration"]
+        for sample in samples
+        if sample["status"] == "succeeded"
+        for attempt in sample["attempts"]
+    ]
+    return BenchmarkResult(
+        environment=environment,
+        samples=len(phenopacket_paths),
+        concurrency=concurrency,
+        work_duration=profile.duration,
+        setup_time=setup_time,
+        wall_time=wall_time,
+        succeeded=sum(1 for sample in samples if sample["status"] == "succeeded"),
+        per_sample_setup_time=setup_time / len(phenopacket_paths) if phenopacket_paths else 0.0,
+        per_sample_overhead=(
+            sum(durations) / len(durations) - profile.duration if durations else 0.0
+        ),
+        throughput=len(phenopacket_paths) / wall_time if wall_time else 0.0,
+    )
+
+
+def run_benchmark(
+    work_dir: Path,
+    environments: List[str],
+    corpus_sizes: List[int],
+    concurrencies: List[int],
+    profile: StandInProfile,
+    variants: int = 1000,
+) -> List[BenchmarkResult]:
+    """
+    Benchmark the orchestration cost of each environment at varying corpus sizes and concurrency.
+
+    Args:
+        work_dir (Path): Working directory for the synthetic corpora and runs.
+        environments (List[str]): Environments to benchmark, i.e., apptainer/docker/nextflow.
+        corpus_sizes (List[int]): Number of samples of each corpus.
+        concurrencies (List[int]): Number of samples run concurrently.
+        profile (StandInProfile): The stand-in profile.
+        variants (int): Number of variants in the VCF file of each sample.
+
+    Returns:
+        List[BenchmarkResult]: The orchestration cost of every run.
+    """
+    if "docker" in environments:
+        try:
+            build_stand_in_image(profile)
+        except Exception as err:
+            print(f"skipping docker: could not build the stand-in image ({err})")
+            environments = [environment for environment in environments if environment != "docker"]
+    results = []
+    with stand_in_environment(work_dir.joinpath("bin"), profile):
+        for samples in corpus_sizes:
+            testdata_dir = work_dir.joinpath(f"corpus_{samples}")
+            if not testdata_dir.is_dir():
+                create_synthetic_corpus(testdata_dir, samples, variants)
+            for environment in environments:
+                for concurrency in sorted(concurrencies):
+                    run_dir = work_dir.joinpath(f"{environment}_{samples}_{concurrency}")
+                    shutil.rmtree(run_dir, ignore_errors=True)
+                    result = benchmark_environment(
+                        environment, testdata_dir, run_dir, concurrency, profile
+                    )
+                    serial = next(
+                        (
+                            serial_result
+                            for serial_result in results
+                            if serial_result.environment == environment
+                            and serial_result.samples == samples
+                            and serial_result.concurrency == 1
+                        ),
+                        result if concurrency == 1 else None,
+                    )
+                    if serial is not None and serial.throughput:
+                        result.speedup = result.throughput / serial.throughput
+                    results.append(result)
+    return results
+
+
+def write_benchmark_report(results: List[BenchmarkResult], report_path: Path) -> None:
+    """
+    Write the benchmark results to a JSON file.
+
+    Args:
+        results (List[BenchmarkResult]): The benchmark results.
+        report_path (Path): The report path.
+    """
+    with open(report_path, "w") as report_file:
+        json.dump([asdict(result) for result in results], report_file, indent=4)
+    report_file.close()
+
+
+@click.command()
+@click.option(
+    "--work-dir",
+    "-w",
+    type=Path,
+    required=True,
+    help="Working directory for the synthetic corpora and runs.",
+)
+@click.option(
+    "--environment",
+    "-e",
+    type=click.Choice(["apptainer", "docker", "nextflow"], case_sensitive=False),
+    multiple=True,
+    default=["apptainer", "nextflow", "docker"],
+    show_default=True,
+    help="Environment to benchmark.",
+)
+@click.option(
+    "--samples",
+    "-n",
+    type=click.IntRange(min=1),
+    multiple=True,
+    default=[10, 50],
+    show_default=True,
+    help="Number of samples in the synthetic corpus.",
+)
+@click.option(
+    "--concurrency",
+    "-c",
+    type=click.IntRange(min=1),
+    multiple=True,
+    default=[1, 2, 4],
+    show_default=True,
+    help="Number of samples run concurrently.",
+)
+@click.option(
+    "--mode",
+    type=click.Choice(["sleep", "cpu"]),
+    default="sleep",
+    show_default=True,
+    help="Whether the stand-in sleeps or burns CPU for the work duration.",
+)
+@click.option(
+    "--duration",
+    "-d",
+    type=click.FloatRange(min=0),
+    default=1.0,
+    show_default=True,
+    help="Duration of the work done by the stand-in per sample in seconds.",
+)
+@click.option(
+    "--variants",
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help="Number of variants in the VCF file of each sample.",
+)
+@click.option(
+    "--report",
+    "-r",
+    "report_path",
+    type=Path,
+    default=None,
+    help="Path to write the JSON benchmark report.",
+)
+def benchmark(
+    work_dir: Path,
+    environment: List[str],
+    samples: List[int],
+    concurrency: List[int],
+    mode: str,
+    duration: float,
+    variants: int,
+    report_path: Optional[Path],
+) -> None:
+    """
+    Benchmark the orchestration cost of running AI-MARRVEL with a stand-in executor.
+
+    Args:
+        work_dir (Path): Working directory for the synthetic corpora and runs.
+        environment (List[str]): Environments to benchmark.
+        samples (List[int]): Number of samples of each synthetic corpus.
+        concurrency (List[int]): Number of samples run concurrently.
+        mode (str): Whether the stand-in sleeps or burns CPU for the work duration.
+        duration (float): Duration of the work done by the stand-in per sample in seconds.
+        variants (int): Number of variants in the VCF file of each sample.
+        report_path (Optional[Path]): Path to write the JSON benchmark report.
+    """
+    work_dir.mkdir(parents=True, exist_ok=True)
+    results = run_benchmark(
+        work_dir,
+        [env.lower() for env in environment],
+        list(samples),
+        list(concurrency),
+        StandInProfile(mode=mode, duration=duration),
+        variants,
+    )
+    for result in results:
+        click.echo(
+            f"{result.environment}: {result.samples} samples, concurrency {result.concurrency}: "
+            f"setup {result.per_sample_setup_time:.3f}s/sample, "
+            f"overhead {result.per_sample_overhead:.3f}s/sample, "
+            f"throughput {result.throughput:.2f} samples/s, speedup {result.speedup or 0:.2f}x"
+        )
+    if report_path:
+        write_benchmark_report(results, report_path)
@@ -0,0 +1,270 @@
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List
+
+PROFILE_ENVIRONMENT_VARIABLE = "AI_MARRVEL_STAND_IN_PROFILE"
+VCF_FILE = "/input/vcf.gz"
+HPO_TXT = "/input/hpo.txt"
+OUTPUT_DIR = "/out"
+
+
+@dataclass
+class StandInProfile:
+    """
+    Profile of the work done by the stand-in for a sample.
+
+    Attributes:
+        mode (str): Either sleep, or cpu to busy-loop for the duration.
+        duration (float): Duration of the work in seconds.
+        feature_columns (int): Number of feature columns written to the integrated CSV.
+        intermediate_outputs (int): Number of intermediate output files written per sample.
+        log_lines (int): Number of lines of output logged per sample.
+        exit_code (int): The exit code, non-zero to simulate a failing pipeline.
+    """
+
+    mode: str = "sleep"
+    duration: float = 0.0
+    feature_columns: int = 40
+    intermediate_outputs: int = 3
+    log_lines: int = 20
+    exit_code: int = 0
+
+    def to_json(self) -> str:
+        """
+        Serialise the profile to JSON.
+
+        Returns:
+            str: The JSON profile.
+        """
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_environment(cls) -> "StandInProfile":
+        """
+        Read the profile from the AI_MARRVEL_STAND_IN_PROFILE environment variable.
+
+        Returns:
+            StandInProfile: The profile, the default profile if the variable is not set.
+        """
+        return cls(**json.loads(os.environ.get(PROFILE_ENVIRONMENT_VARIABLE, "{}")))
+
+
+def read_variants(vcf_path: Path) -> List[List[str]]:
+    """
+    Read the variant records of a gzipped VCF file.
+
+    Args:
+        vcf_path (Path): Path to the VCF file.
+
+    Returns:
+        List[List[str]]: The tab separated fields of each variant record.
+    """
+    with gzip.open(vcf_path, "rt") as vcf_file:
+        return [line.rstrip("\n").split("\t") for line in vcf_file if not line.startswith("#")]
+
+
+def obtain_gene_symbol(record: List[str]) -> str:
+    """
+    Obtain the gene symbol of a variant from the GENE INFO field, or derive one from its position.
+
+    Args:
+        record (List[str]): The fields of the variant record.
+
+    Returns:
+        str: The gene symbol.
+    """
+    info_fields = record[7].split(";") if len(record) > 7 else []
+    info = dict(field.split("=", 1) for field in info_fields if "=" in field)
+    return info.get("GENE", f"GENE{int(record[1]) // 100000}")
+
+
+def score_variant(sample_id: str, variant: str) -> float:
+    """
+    Deterministically score a variant for a sample.
+
+    Args:
+        sample_id (str): The sample ID.
+        variant (str): The variant, formatted as chrom-pos-ref-alt.
+
+    Returns:
+        float: The score, between 0 and 1.
+    """
+    digest = hashlib.sha256(f"{sample_id}:{variant}".encode()).digest()
+    return int.from_bytes(digest[:4], "big") / 2**32
+
+
+def do_work(profile: StandInProfile) -> None:
+    """
+    Sleep or busy-loop for the duration of the profile.
+
+    Args:
+        profile (StandInProfile): The profile.
+    """
+    if profile.mode == "cpu":
+        end = time.monotonic() + profile.duration
+        while time.monotonic() < end:
+            sum(i * i for i in range(1000))
+    else:
+        time.sleep(profile.duration)
+
+
+def write_integrated_csv(
+    sample_id: str, vcf_path: Path, output_dir: Path, profile: StandInProfile
+) -> Path:
+    """
+    Write an integrated CSV scoring every variant of the VCF file, in the format of AI-MARRVEL.
+
+    Args:
+        sample_id (str): The sample ID.
+        vcf_path (Path): Path to the VCF file.
+        output_dir (Path): Path to the output directory.
+        profile (StandInProfile): The profile.
+
+    Returns:
+        Path: Path to the integrated CSV.
+    """
+    scored_variants = sorted(
+        (
+            (score_variant(sample_id, variant), variant, obtain_gene_symbol(record))
+            for record in read_variants(vcf_path)
+            for variant in [f"{record[0]}-{record[1]}-{record[3]}-{record[4]}"]
+        ),
+        reverse=True,
+    )
+    features = [f"feature_{i}" for i in range(profile.feature_columns)]
+    integrated_csv_path = output_dir.joinpath(f"{sample_id}_integrated.csv")
+    with open(integrated_csv_path, "w") as integrated_csv:
+        integrated_csv.write(
+            ",".join(["Unnamed: 0", "geneSymbol", *features, "predict", "ranking"]) + "\n"
+        )
+        for ranking, (score, variant, gene_symbol) in enumerate(scored_variants, start=1):
+            feature_values = [f"{(score * (i + 1)) % 1:.4f}" for i in range(len(features))]
+            integrated_csv.write(
+                ",".join([variant, gene_symbol, *feature_values, f"{score:.6f}", str(ranking)])
+                + "\n"
+            )
+    integrated_csv.close()
+    return integrated_csv_path
+
+
+def run_stand_in(
+    sample_id: str, vcf_path: Path, hpo_txt: Path, output_dir: Path, profile: StandInProfile
+) -> int:
+    """
+    Run the stand-in for a sample.
+
+    Args:
+        sample_id (str): The sample ID.
+        vcf_path (Path): Path to the VCF file.
+        hpo_txt (Path): Path to the HPO txt file.
+        output_dir (Path): Path to the output directory.
+        profile (StandInProfile): The profile.
+
+    Returns:
+        int: The exit code.
+    """
+    hpo_ids = hpo_txt.read_text().split()
+    print(f"running stand-in for {sample_id} with {len(hpo_ids)} HPO ids", flush=True)
+    for line in range(profile.log_lines):
+        print(f"[{sample_id}] stage {line + 1}/{profile.log_lines}", flush=True)
+    do_work(profile)
+    if profile.exit_code != 0:
+        print(f"{sample_id} failed", flush=True)
+        return profile.exit_code
+    for intermediate_output in range(profile.intermediate_outputs):
+        output_dir.joinpath(f"{sample_id}_intermediate_{intermediate_output}.txt").write_text(
+            "\n".join(hpo_ids)
+        )
+    write_integrated_csv(sample_id, vcf_path, output_dir, profile)
+    return 0
+
+
+def parse_apptainer_arguments(arguments: List[str]) -> Dict[str, str]:
+    """
+    Parse the arguments of an apptainer run command into the mounted paths and sample ID.
+
+    Args:
+        arguments (List[str]): The arguments following apptainer.
+
+    Returns:
+        Dict[str, str]: The VCF, HPO txt and output paths and the sample ID.
+    """
+    mounts = {}
+    for argument, value in zip(arguments, arguments[1:]):
+        if argument == "--mount":
+            bind = dict(option.split("=", 1) for option in value.split(","))
+            mounts[bind["destination"]] = bind["source"]
+    proc_arguments = arguments[arguments.index("/run/proc.sh") + 1 :]
+    return {
+        "vcf_path": mounts[VCF_FILE],
+        "hpo_txt": mounts[HPO_TXT],
+        "output_dir": mounts[OUTPUT_DIR],
+        "sample_id": proc_arguments[0],
+    }
+
+
+def parse_nextflow_arguments(arguments: List[str]) -> Dict[str, str]:
+    """
+    Parse the arguments of a nextflow run command into the input paths and sample ID.
+
+    Args:
+        arguments (List[str]): The arguments following nextflow.
+
+    Returns:
+        Dict[str, str]: The VCF, HPO txt and output paths and the sample ID.
+    """
+    parameters = dict(zip(arguments, arguments[1:]))
+    return {
+        "vcf_path": parameters["--input_vcf"],
+        "hpo_txt": parameters["--input_hpo"],
+        "output_dir": parameters["--outdir"],
+        "sample_id": parameters["--run_id"],
+    }
+
+
+def main(arguments: List[str]) -> int:
+    """
+    Run the stand-in as invoked by proc.sh, apptainer or nextflow, i.e.,
+    `proc SAMPLE_ID ASSEMBLY MEMORY`, `apptainer run --mount ... IMAGE /run/proc.sh ...` or
+    `nextflow run MAIN_NF --input_vcf ... --input_hpo ... --outdir ... --run_id ...`.
+
+    Only the standard library is used, so that the stand-in can be copied into a container image.
+
+    Args:
+        arguments (List[str]): The command line arguments.
+
+    Returns:
+        int: The exit code.
+    """
+    invocation, arguments = arguments[0], arguments[1:]
+    if invocation == "proc":
+        sample = {
+            "vcf_path": VCF_FILE,
+            "hpo_txt": HPO_TXT,
+            "output_dir": OUTPUT_DIR,
+            "sample_id": arguments[0],
+        }
+    elif invocation == "apptainer":
+        sample = parse_apptainer_arguments(arguments)
+    elif invocation == "nextflow":
+        sample = parse_nextflow_arguments(arguments)
+    else:
+        print(f"Unknown invocation {invocation}.", file=sys.stderr)
+        return 2
+    return run_stand_in(
+        sample["sample_id"],
+        Path(sample["vcf_path"]),
+        Path(sample["hpo_txt"]),
+        Path(sample["output_dir"]),
+        StandInProfile.from_environment(),
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
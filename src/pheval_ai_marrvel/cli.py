@@ -1,6 +1,9 @@
 import click
 
+from pheval_ai_marrvel.benchmark.benchmark import benchmark
+from pheval_ai_marrvel.plan.plan import plan
 from pheval_ai_marrvel.post_process.post_process import post_process
+from pheval_ai_marrvel.validate.validate import validate
 
 
 @click.group()
@@ -8,7 +11,10 @@ def main():
     """AI-MARRVEL runner."""
 
 
+main.add_command(benchmark)
+main.add_command(plan)
 main.add_command(post_process)
+main.add_command(validate)
 
 if __name__ == "__main__":
     main()
@@ -2,3 +2,11 @@ VCF_FILE = "/input/vcf.gz"
 HPO_TXT = "/input/hpo.txt"
 DATA_DEPENDENCIES = "/run/data_dependencies"
 OUTPUT_DIR = "/out"
+AI_MARRVEL_IMAGE = "chaozhongliu/aim-lite"
+APPTAINER_MEMORY_GB = 32
+DOCKER_MEMORY_GB = 30
+GENE_AGGREGATIONS = ["max", "sum", "mean"]
+RAW_RESULT_SUFFIX = "_integrated.csv"
+COMPRESSED_RAW_RESULT_SUFFIX = "_integrated.csv.zst"
+RAW_RESULTS_INDEX = "raw_results_index.jsonl"
+RAW_OUTPUT_RETENTIONS = ["keep", "delete", "archive"]
@@ -0,0 +1,319 @@
+import json
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import click
+
+from pheval_ai_marrvel.constants import APPTAINER_MEMORY_GB, DOCKER_MEMORY_GB
+
+
+@dataclass
+class PlannedSample:
+    """
+    Planned AI-MARRVEL run for a sample.
+
+    Attributes:
+        sample_id (str): The sample ID.
+        phenopacket_path (str): The phenopacket path.
+        vcf_path (Optional[str]): The VCF file path.
+        vcf_size (int): The size of the VCF file in bytes.
+        genome_assembly (Optional[str]): The genome assembly, as passed to AI-MARRVEL.
+        status (str): One of run, completed, duplicate or invalid.
+        estimated_runtime (float): The estimated runtime in seconds, 0 if the sample is not run.
+        duplicate_of (Optional[str]): ID of the sample sharing the workload that is run instead.
+    """
+
+    sample_id: str
+    phenopacket_path: str
+    vcf_path: Optional[str]
+    vcf_size: int
+    genome_assembly: Optional[str]
+    status: str
+    estimated_runtime: float = 0.0
+    duplicate_of: Optional[str] = None
+
+
+def get_planned_sample(
+    phenopacket_path: Path, testdata_dir: Path, input_dir: Path, output_dir: Path, environment: str
+) -> PlannedSample:
+    """
+    Build the environment specific arguments for a sample, without running anything.
+
+    Args:
+        phenopacket_path (Path): The phenopacket path.
+        testdata_dir (Path): The testdata directory.
+        input_dir (Path): The input directory.
+        output_dir (Path): The output directory.
+        environment (str): Environment to run AI-MARRVEL, i.e., apptainer/docker/nextflow.
+
+    Returns:
+        PlannedSample: The planned run for the sample.
+    """
+    if environment.lower() == "apptainer":
+        from pheval_ai_marrvel.run.create_apptainer_commands import get_apptainer_arguments
+
+        apptainer_arguments = get_apptainer_arguments(
+            phenopacket_path, testdata_dir, input_dir, output_dir
+        )
+        sample_id, vcf_path, genome_assembly = (
+            apptainer_arguments.sample_id,
+            apptainer_arguments.vcf_path,
+            apptainer_arguments.vcf_assembly,
+        )
+    elif environment.lower() == "docker":
+        from pheval_ai_marrvel.run.create_docker_commands import get_sample_data
+
+        sample_data = get_sample_data(phenopacket_path, testdata_dir.joinpath("vcf"))
+        sample_id, vcf_path, genome_assembly = (
+            sample_data.sample_id,
+            sample_data.vcf_name,
+            sample_data.genome_assembly,
+        )
+    elif environment.lower() == "nextflow":
+        from pheval_ai_marrvel.run.prepare_next_flow_commands import get_next_flow_parameters
+
+        next_flow_parameters = get_next_flow_parameters(
+            phenopacket_path, testdata_dir, input_dir, output_dir
+        )
+        sample_id, vcf_path, genome_assembly = (
+            next_flow_parameters.sample_id,
+            next_flow_parameters.input_vcf,
+            next_flow_parameters.reference_version,
+        )
+    else:
+        raise ValueError(f"Unknown environment {environment}.")
+    return PlannedSample(
+        sample_id=sample_id,
+        phenopacket_path=str(phenopacket_path),
+        vcf_path=str(vcf_path),
+        vcf_size=Path(vcf_path).stat().st_size,
+        genome_assembly=genome_assembly,
+        status="run",
+    )
+
+
+def plan_corpus(
+    testdata_dir: Path,
+    input_dir: Path,
+    output_dir: Path,
+    environment: str,
+    concurrency: int = 1,
+    history_dirs: Optional[List[Path]] = None,
+    deduplicate: bool = True,
+) -> dict:
+    """
+    Plan running AI-MARRVEL on a corpus and estimate its cost, without running anything.
+
+    Args:
+        testdata_dir (Path): Path to the test data directory.
+        input_dir (Path): Path to the input directory.
+        output_dir (Path): Path to the output directory.
+        environment (str): Environment to run AI-MARRVEL, i.e., apptainer/docker/nextflow.
+        concurrency (int): Number of samples assumed to run concurrently.
+        history_dirs (Optional[List[Path]]): Directories containing run reports of previous runs,
+            used to calibrate the runtime model.
+        deduplicate (bool): Plan running samples sharing an identical workload once.
+
+    Returns:
+        dict: The plan.
+    """
+    from pheval.utils.file_utils import all_files
+
+    from pheval_ai_marrvel.plan.runtime_model import calibrate_runtime_model, estimate_wall_time
+    from pheval_ai_marrvel.run.deduplicate_workloads import group_workloads
+    from pheval_ai_marrvel.run.run import completed_sample_ids
+    from pheval_ai_marrvel.validate.validate_inputs import (
+        OUTPUT_SIZE_TO_VCF_SIZE_RATIO,
+        validate_inputs,
+    )
+
+    validation_report = validate_inputs(
+        all_files(testdata_dir.joinpath("phenopackets")), testdata_dir, output_dir
+    )
+    completed = completed_sample_ids(output_dir)
+    runtime_model = calibrate_runtime_model(
+        [
+            run_report_path
+            for history_dir in history_dirs or []
+            for run_report_path in history_dir.glob("*_run_report.json")
+        ]
+    )
+    planned_samples = []
+    for sample in validation_report.samples:
+        if not sample.valid:
+            planned_samples.append(
+                PlannedSample(
+                    sample_id=sample.sample_id,
+                    phenopacket_path=sample.phenopacket_path,
+                    vcf_path=sample.vcf_path,
+                    vcf_size=sample.vcf_size,
+                    genome_assembly=sample.genome_assembly,
+                    status="invalid",
+                )
+            )
+            continue
+        planned_sample = get_planned_sample(
+            Path(sample.phenopacket_path), testdata_dir, input_dir, output_dir, environment
+        )
+        if planned_sample.sample_id in completed:
+            planned_sample.status = "completed"
+        else:
+            planned_sample.estimated_runtime = runtime_model.estimate(planned_sample.vcf_size)
+        planned_samples.append(planned_sample)
+    if deduplicate:
+        planned_sample_by_phenopacket = {
+            planned_sample.phenopacket_path: planned_sample for planned_sample in planned_samples
+        }
+        for workload in group_workloads(validation_report.valid_samples):
+            workload_samples = [
+                planned_sample_by_phenopacket[sample.phenopacket_path] for sample in workload
+            ]
+            representative = next(
+                (sample for sample in workload_samples if sample.status == "completed"),
+                workload_samples[0],
+            )
+            for planned_sample in workload_samples:
+                if planned_sample is not representative and planned_sample.status == "run":
+                    planned_sample.status = "duplicate"
+                    planned_sample.estimated_runtime = 0.0
+                    planned_sample.duplicate_of = representative.sample_id
+    samples_to_run = [sample for sample in planned_samples if sample.status == "run"]
+    memory_gb = {"apptainer": APPTAINER_MEMORY_GB, "docker": DOCKER_MEMORY_GB}.get(
+        environment.lower()
+    )
+    statuses = Counter(sample.status for sample in planned_samples)
+    return {
+        "environment": environment,
+        "concurrency": concurrency,
+        "total_samples": len(planned_samples),
+        "samples_to_run": statuses["run"],
+        "skipped_completed": statuses["completed"],
+        "skipped_invalid": statuses["invalid"],
+        "skipped_duplicate": statuses["duplicate"],
+        "total_vcf_size": sum(sample.vcf_size for sample in samples_to_run),
+        "assembly_breakdown": dict(Counter(sample.genome_assembly for sample in samples_to_run)),
+        "runtime_model": asdict(runtime_model),
+        "estimated_total_runtime": sum(sample.estimated_runtime for sample in samples_to_run),
+        "estimated_wall_time": estimate_wall_time(
+            [sample.estimated_runtime for sample in samples_to_run], concurrency
+        ),
+        "estimated_peak_memory_gb": (
+            memory_gb * min(concurrency, len(samples_to_run)) if memory_gb else None
+        ),
+        "estimated_output_size": sum(
+            sample.vcf_size * OUTPUT_SIZE_TO_VCF_SIZE_RATIO for sample in samples_to_run
+        ),
+        "free_disk_space": validation_report.free_disk_space,
+        "samples": [asdict(sample) for sample in planned_samples],
+    }
+
+
+def write_plan(plan: dict, plan_path: Path) -> None:
+    """
+    Write the plan to a JSON file.
+
+    Args:
+        plan (dict): The plan.
+        plan_path (Path): Path to write the plan.
+    """
+    with open(plan_path, "w") as plan_file:
+        json.dump(plan, plan_file, indent=4)
+    plan_file.close()
+
+
+@click.command()
+@click.option(
+    "--input-dir",
+    "-i",
+    type=Path,
+    required=True,
+    help="Path to the input directory.",
+)
+@click.option(
+    "--testdata-dir",
+    "-t",
+    type=Path,
+    required=True,
+    help="Path to the test data directory.",
+)
+@click.option(
+    "--output-dir",
+    "-o",
+    type=Path,
+    required=True,
+    help="Path to the raw results output directory.",
+)
+@click.option(
+    "--environment",
+    "-e",
+    type=click.Choice(["apptainer", "docker", "nextflow"], case_sensitive=False),
+    required=True,
+    help="Environment to run AI-MARRVEL.",
+)
+@click.option(
+    "--concurrency",
+    "-c",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of samples assumed to run concurrently.",
+)
+@click.option(
+    "--history-dir",
+    "-H",
+    type=Path,
+    multiple=True,
+    help="Directory containing run reports of previous runs, used to calibrate the runtime model.",
+)
+@click.option(
+    "--deduplicate/--no-deduplicate",
+    default=True,
+    show_default=True,
+    help="Plan running samples sharing a VCF, HPO ids and genome assembly once.",
+)
+@click.option(
+    "--plan",
+    "-p",
+    "plan_path",
+    type=Path,
+    default=None,
+    help="Path to write the JSON plan, printed to stdout if not specified.",
+)
+def plan(
+    input_dir: Path,
+    testdata_dir: Path,
+    output_dir: Path,
+    environment: str,
+    concurrency: int,
+    history_dir: List[Path],
+    deduplicate: bool,
+    plan_path: Optional[Path],
+) -> None:
+    """
+    Plan running AI-MARRVEL on a corpus and estimate its cost, without running anything.
+
+    Args:
+        input_dir (Path): Path to the input directory.
+        testdata_dir (Path): Path to the test data directory.
+        output_dir (Path): Path to the raw results output directory.
+        environment (str): Environment to run AI-MARRVEL, i.e., apptainer/docker/nextflow.
+        concurrency (int): Number of samples assumed to run concurrently.
+        history_dir (List[Path]): Directories containing run reports of previous runs.
+        deduplicate (bool): Plan running samples sharing an identical workload once.
+        plan_path (Optional[Path]): Path to write the JSON plan.
+    """
+    corpus_plan = plan_corpus(
+        testdata_dir,
+        input_dir,
+        output_dir,
+        environment,
+        concurrency,
+        list(history_dir),
+        deduplicate,
+    )
+    if plan_path:
+        write_plan(corpus_plan, plan_path)
+    else:
+        click.echo(json.dumps(corpus_plan, indent=4))
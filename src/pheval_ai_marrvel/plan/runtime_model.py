@@ -0,0 +1,108 @@
+import heapq
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Tuple
+
+DEFAULT_SAMPLE_RUNTIME = 3600.0
+
+
+@dataclass
+class RuntimeModel:
+    """
+    Linear model of the AI-MARRVEL runtime of a sample from the size of its VCF file.
+
+    Attributes:
+        intercept (float): Runtime in seconds independent of the VCF size.
+        seconds_per_byte (float): Runtime in seconds per byte of VCF.
+        calibration_samples (int): Number of previous runs the model was calibrated against.
+    """
+
+    intercept: float = DEFAULT_SAMPLE_RUNTIME
+    seconds_per_byte: float = 0.0
+    calibration_samples: int = 0
+
+    def estimate(self, vcf_size: int) -> float:
+        """
+        Estimate the runtime of a sample.
+
+        Args:
+            vcf_size (int): The size of the VCF file in bytes.
+
+        Returns:
+            float: The estimated runtime in seconds.
+        """
+        return max(0.0, self.intercept + self.seconds_per_byte * vcf_size)
+
+
+def obtain_recorded_runtimes(run_report_paths: List[Path]) -> List[Tuple[int, float]]:
+    """
+    Obtain the VCF size and runtime of successful samples recorded in previous run reports.
+
+    Args:
+        run_report_paths (List[Path]): Paths to previous run reports.
+
+    Returns:
+        List[Tuple[int, float]]: The VCF size in bytes and runtime in seconds of each sample.
+    """
+    recorded_runtimes = []
+    for run_report_path in run_report_paths:
+        with open(run_report_path) as run_report_file:
+            run_report = json.load(run_report_file)
+        run_report_file.close()
+        for sample in run_report["samples"]:
+            if sample["status"] == "succeeded" and sample.get("vcf_size") and sample["attempts"]:
+                recorded_runtimes.append((sample["vcf_size"], sample["attempts"][-1]["duration"]))
+    return recorded_runtimes
+
+
+def calibrate_runtime_model(run_report_paths: List[Path]) -> RuntimeModel:
+    """
+    Calibrate the runtime model with a least squares fit against previously recorded runtimes.
+
+    If the fitted runtime does not increase with the VCF size, as can happen with few or noisy
+    recorded runtimes, the mean recorded runtime is used for every sample instead.
+
+    Args:
+        run_report_paths (List[Path]): Paths to previous run reports.
+
+    Returns:
+        RuntimeModel: The calibrated runtime model, the default model if nothing was recorded.
+    """
+    recorded_runtimes = obtain_recorded_runtimes(run_report_paths)
+    if not recorded_runtimes:
+        return RuntimeModel()
+    n = len(recorded_runtimes)
+    mean_size = sum(size for size, _ in recorded_runtimes) / n
+    mean_runtime = sum(runtime for _, runtime in recorded_runtimes) / n
+    size_variance = sum((size - mean_size) ** 2 for size, _ in recorded_runtimes)
+    if size_variance == 0:
+        return RuntimeModel(intercept=mean_runtime, calibration_samples=n)
+    seconds_per_byte = (
+        sum((size - mean_size) * (runtime - mean_runtime) for size, runtime in recorded_runtimes)
+        / size_variance
+    )
+    if seconds_per_byte <= 0:
+        return RuntimeModel(intercept=mean_runtime, calibration_samples=n)
+    return RuntimeModel(
+        intercept=mean_runtime - seconds_per_byte * mean_size,
+        seconds_per_byte=seconds_per_byte,
+        calibration_samples=n,
+    )
+
+
+def estimate_wall_time(runtimes: List[float], concurrency: int) -> float:
+    """
+    Estimate the wall time of running samples with a given concurrency, scheduling the longest first.
+
+    Args:
+        runtimes (List[float]): The estimated runtime of each sample in seconds.
+        concurrency (int): Number of samples run concurrently.
+
+    Returns:
+        float: The estimated wall time in seconds.
+    """
+    workers = [0.0] * min(concurrency, len(runtimes))
+    for runtime in sorted(runtimes, reverse=True):
+        heapq.heapreplace(workers, workers[0] + runtime)
+    return max(workers, default=0.0)
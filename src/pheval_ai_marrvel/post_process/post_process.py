@@ -1,19 +1,42 @@
 from pathlib import Path
+from typing import Optional
 
 import click
 
-from pheval_ai_marrvel.post_process.post_process_results_format import create_standardised_results
+from pheval_ai_marrvel.constants import GENE_AGGREGATIONS
 
 
-def post_process_results(raw_results_dir: Path, output_dir: Path) -> None:
+def post_process_results(
+    raw_results_dir: Path,
+    output_dir: Path,
+    top_k: Optional[int] = None,
+    gene_aggregation: Optional[str] = None,
+    gene_variant_counts: bool = False,
+) -> None:
     """
     Post-process AI-MARRVEL raw results and create standardised PhEval TSV results.
 
     Args:
         raw_results_dir (Path): Path to the raw results directory.
         output_dir (Path): Path to the output directory.
+        top_k (Optional[int]): Only output the top-k scoring entries per sample, if specified.
+        gene_aggregation (Optional[str]): Reducer used to aggregate variant scores per gene.
+        gene_variant_counts (bool): Write the number of variants scored per aggregated gene.
+
+    Raises:
+        ValueError: If gene variant counts are requested without a gene aggregation.
     """
-    create_standardised_results(raw_results_dir, output_dir)
+    from pheval_ai_marrvel.post_process.post_process_results_format import (
+        create_standardised_results,
+    )
+
+    if gene_variant_counts:
+        if gene_aggregation is None:
+            raise ValueError("Gene variant counts require a gene aggregation.")
+        output_dir.joinpath("gene_variant_counts").mkdir(exist_ok=True)
+    create_standardised_results(
+        raw_results_dir, output_dir, top_k, gene_aggregation, gene_variant_counts
+    )
 
 
 @click.command()
@@ -27,14 +50,45 @@ def post_process_results(raw_results_dir: Path, output_dir: Path) -> None:
     "-o",
     type=Path,
 )
-def post_process(raw_results_dir: Path, output_dir: Path) -> None:
+@click.option(
+    "--top-k",
+    "-k",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Only output the top-k scoring entries per sample, ties at the cutoff are retained.",
+)
+@click.option(
+    "--gene-aggregation",
+    "-g",
+    type=click.Choice(GENE_AGGREGATIONS),
+    default=None,
+    help="Aggregate variant scores to one row per gene with the given reducer.",
+)
+@click.option(
+    "--gene-variant-counts",
+    is_flag=True,
+    default=False,
+    help="Write the number of variants scored per aggregated gene, requires --gene-aggregation.",
+)
+def post_process(
+    raw_results_dir: Path,
+    output_dir: Path,
+    top_k: Optional[int],
+    gene_aggregation: Optional[str],
+    gene_variant_counts: bool,
+) -> None:
     """
     Post-process AI-MARRVEL raw results and create standardised PhEval TSV results.
 
     Args:
         raw_results_dir (Path): Path to the raw results directory.
         output_dir (Path): Path to the output directory.
+        top_k (Optional[int]): Only output the top-k scoring entries per sample, if specified.
+        gene_aggregation (Optional[str]): Reducer used to aggregate variant scores per gene.
+        gene_variant_counts (bool): Write the number of variants scored per aggregated gene.
     """
+    if gene_variant_counts and gene_aggregation is None:
+        raise click.UsageError("--gene-variant-counts requires --gene-aggregation.")
     output_dir.joinpath("pheval_gene_results").mkdir(exist_ok=True)
     output_dir.joinpath("pheval_variant_results").mkdir(exist_ok=True)
-    post_process_results(raw_results_dir, output_dir)
+    post_process_results(raw_results_dir, output_dir, top_k, gene_aggregation, gene_variant_counts)
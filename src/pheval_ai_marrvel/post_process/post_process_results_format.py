@@ -1,5 +1,6 @@
+from io import BytesIO
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 import polars as pl
 from pheval.post_processing.post_processing import (
@@ -8,13 +9,15 @@ from pheval.post_processing.post_processing import (
     calculate_end_pos,
     generate_pheval_result,
 )
-from pheval.utils.file_utils import all_files
 from pheval.utils.phenopacket_utils import GeneIdentifierUpdater, create_hgnc_dict
 
+from pheval_ai_marrvel.constants import GENE_AGGREGATIONS
+from pheval_ai_marrvel.raw_results import find_raw_results, read_raw_result_bytes
+
 
 def read_raw_result(raw_result_path: Path) -> pl.DataFrame:
     """
-    Read the raw result file.
+    Read the raw result file, decompressing it if it is zstd compressed.
 
     Args:
         raw_result_path(Path): Path to the raw result file.
@@ -22,7 +25,11 @@ def read_raw_result(raw_result_path: Path) -> pl.DataFrame:
     Returns:
         pl.DataFrame: Contents of the raw result file.
     """
-    raw_result = pl.read_csv(raw_result_path)
+    raw_result = (
+        pl.read_csv(BytesIO(read_raw_result_bytes(raw_result_path)))
+        if raw_result_path.name.endswith(".zst")
+        else pl.read_csv(raw_result_path)
+    )
     raw_result = raw_result.rename({"Unnamed: 0": "variant"})
     raw_result = raw_result.select(pl.col(["variant", "predict", "geneSymbol", "ranking"]))
     grouped_gene_symbols = (
@@ -36,6 +43,75 @@ def read_raw_result(raw_result_path: Path) -> pl.DataFrame:
     return raw_result
 
 
+GENE_AGGREGATION_REDUCERS = {
+    gene_aggregation: getattr(pl.col("predict"), gene_aggregation)()
+    for gene_aggregation in GENE_AGGREGATIONS
+}
+
+
+def select_top_k(raw_result: pl.DataFrame, top_k: int) -> pl.DataFrame:
+    """
+    Select the top-k scoring entries from the raw result.
+
+    Every entry tied with the k-th highest score is also retained so that the ranks
+    assigned to the retained entries are identical to the ranks in the untruncated output.
+
+    Args:
+        raw_result (pl.DataFrame): Contents of the raw result file.
+        top_k (int): Number of highest scoring entries to retain.
+
+    Returns:
+        pl.DataFrame: The truncated raw result.
+    """
+    if top_k >= raw_result.height:
+        return raw_result
+    score_threshold = raw_result.select(pl.col("predict").top_k(top_k).min()).item()
+    return raw_result.filter(pl.col("predict") >= score_threshold)
+
+
+def aggregate_gene_results(raw_result: pl.DataFrame, gene_aggregation: str) -> pl.DataFrame:
+    """
+    Aggregate the variant scores of the raw result to a single score per gene.
+
+    Args:
+        raw_result (pl.DataFrame): Contents of the raw result file.
+        gene_aggregation (str): Reducer applied to the variant scores of a gene, i.e., max/sum/mean.
+
+    Returns:
+        pl.DataFrame: The aggregated gene scores and number of variants scored for each gene.
+    """
+    return (
+        raw_result.select(pl.col(["variant", "predict", "groupedGeneSymbol"]))
+        .explode("groupedGeneSymbol")
+        .drop_nulls("groupedGeneSymbol")
+        .group_by("groupedGeneSymbol", maintain_order=True)
+        .agg(
+            GENE_AGGREGATION_REDUCERS[gene_aggregation],
+            pl.col("variant").n_unique().alias("variantCount"),
+        )
+        .rename({"groupedGeneSymbol": "geneSymbol"})
+    )
+
+
+def write_gene_variant_counts(
+    aggregated_gene_result: pl.DataFrame, output_dir: Path, tool_result_path: Path
+) -> None:
+    """
+    Write the number of variants scored for each gene to a TSV file.
+
+    Args:
+        aggregated_gene_result (pl.DataFrame): The aggregated gene scores.
+        output_dir (Path): Path to the output directory.
+        tool_result_path (Path): Path to the tool-specific result file.
+    """
+    aggregated_gene_result.select(
+        pl.col("geneSymbol").alias("gene_symbol"), pl.col("variantCount").alias("variant_count")
+    ).write_csv(
+        output_dir.joinpath(f"gene_variant_counts/{tool_result_path.stem}-gene_variant_counts.tsv"),
+        separator="\t",
+    )
+
+
 class ConvertToPhEvalResult:
     """Class to convert the raw result file to PhEvalGeneResult and PhEvalVariantResult."""
 
@@ -162,6 +238,31 @@ class ConvertToPhEvalResult:
             )
         return pheval_result
 
+    def extract_pheval_aggregated_gene_requirements(
+        self, aggregated_gene_result: pl.DataFrame
+    ) -> List[PhEvalGeneResult]:
+        """
+        Extract the data required to produce PhEval gene output from aggregated gene scores.
+
+        Args:
+            aggregated_gene_result (pl.DataFrame): The aggregated gene scores.
+
+        Returns:
+            List[PhEvalGeneResult]: List of PhEvalGeneResult objects.
+        """
+        pheval_result = []
+        for result_entry in aggregated_gene_result.rows(named=True):
+            pheval_result.append(
+                PhEvalGeneResult(
+                    gene_symbol=result_entry["geneSymbol"],
+                    gene_identifier=self.gene_identifier_updater.find_identifier(
+                        result_entry["geneSymbol"]
+                    ),
+                    score=self._obtain_score(result_entry),
+                )
+            )
+        return pheval_result
+
     def extract_pheval_variant_requirements(self) -> List[PhEvalVariantResult]:
         """
         Extract the data required to produce PhEval variant output.
@@ -187,32 +288,55 @@ class ConvertToPhEvalResult:
         return pheval_result
 
 
-def create_standardised_results(raw_results_dir: Path, output_dir: Path) -> None:
+def create_standardised_results(
+    raw_results_dir: Path,
+    output_dir: Path,
+    top_k: Optional[int] = None,
+    gene_aggregation: Optional[str] = None,
+    gene_variant_counts: bool = False,
+) -> None:
     """
     Create PhEval gene and variant tsv output from raw results.
 
     Args:
         raw_results_dir (Path): Path to the raw results directory.
         output_dir (Path): Path to the output directory.
+        top_k (Optional[int]): Only output the top-k scoring entries per sample, if specified.
+        gene_aggregation (Optional[str]): Reducer used to aggregate variant scores to one row per
+            gene, i.e., max/sum/mean. If not specified, one gene row is output per variant.
+        gene_variant_counts (bool): Write the number of variants scored per aggregated gene.
     """
     gene_identifier_updator = GeneIdentifierUpdater(
         gene_identifier="ensembl_id", hgnc_data=create_hgnc_dict()
     )
-    raw_results = [file for file in all_files(raw_results_dir) if "_integrated.csv" in file.name]
-    for raw_result_path in raw_results:
+    for sample_id, raw_result_path in find_raw_results(raw_results_dir).items():
+        tool_result_path = raw_results_dir.joinpath(f"{sample_id}.csv")
         raw_result = read_raw_result(raw_result_path)
-        converter = ConvertToPhEvalResult(raw_result, gene_identifier_updator)
-        pheval_gene_result = converter.extract_pheval_gene_requirements()
+        converter = ConvertToPhEvalResult(
+            select_top_k(raw_result, top_k) if top_k is not None else raw_result,
+            gene_identifier_updator,
+        )
+        if gene_aggregation is not None:
+            aggregated_gene_result = aggregate_gene_results(raw_result, gene_aggregation)
+            if gene_variant_counts:
+                write_gene_variant_counts(aggregated_gene_result, output_dir, tool_result_path)
+            if top_k is not None:
+                aggregated_gene_result = select_top_k(aggregated_gene_result, top_k)
+            pheval_gene_result = converter.extract_pheval_aggregated_gene_requirements(
+                aggregated_gene_result
+            )
+        else:
+            pheval_gene_result = converter.extract_pheval_gene_requirements()
         generate_pheval_result(
             pheval_result=pheval_gene_result,
             sort_order_str="DESCENDING",
             output_dir=output_dir,
-            tool_result_path=Path(str(raw_result_path).replace("_integrated", "")),
+            tool_result_path=tool_result_path,
         )
         pheval_variant_result = converter.extract_pheval_variant_requirements()
         generate_pheval_result(
             pheval_result=pheval_variant_result,
             sort_order_str="DESCENDING",
             output_dir=output_dir,
-            tool_result_path=Path(str(raw_result_path).replace("_integrated", "")),
+            tool_result_path=tool_result_path,
         )
@@ -0,0 +1,149 @@
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+from pheval_ai_marrvel.constants import (
+    COMPRESSED_RAW_RESULT_SUFFIX,
+    RAW_RESULT_SUFFIX,
+    RAW_RESULTS_INDEX,
+)
+
+
+def raw_result_sample_id(raw_result_path: Path) -> Optional[str]:
+    """
+    Obtain the sample ID from the name of a raw result file.
+
+    Args:
+        raw_result_path (Path): Path to the raw result file.
+
+    Returns:
+        Optional[str]: The sample ID, None if the file is not a raw result.
+    """
+    for suffix in [RAW_RESULT_SUFFIX, COMPRESSED_RAW_RESULT_SUFFIX]:
+        if raw_result_path.name.endswith(suffix):
+            return raw_result_path.name[: -len(suffix)]
+    return None
+
+
+def write_index_entry(
+    output_dir: Path, sample_id: str, raw_result_path: Path, archive_path: Optional[Path] = None
+) -> None:
+    """
+    Append the raw result of a finished sample to the raw results index of the output directory.
+
+    Args:
+        output_dir (Path): Path to the output directory.
+        sample_id (str): The sample ID.
+        raw_result_path (Path): Path to the raw result file.
+        archive_path (Optional[Path]): Path to the archive of the other outputs of the sample.
+    """
+    index_entry = {
+        "sample_id": sample_id,
+        "raw_result": raw_result_path.name,
+        "archive": archive_path.name if archive_path else None,
+    }
+    with open(output_dir.joinpath(RAW_RESULTS_INDEX), "a") as index_file:
+        index_file.write(json.dumps(index_entry) + "\n")
+    index_file.close()
+
+
+def read_raw_results_index(output_dir: Path) -> Dict[str, Path]:
+    """
+    Read the raw result of every sample recorded in the raw results index of the output directory.
+
+    Args:
+        output_dir (Path): Path to the output directory.
+
+    Returns:
+        Dict[str, Path]: The raw result path for each sample ID, empty if there is no index.
+    """
+    index_path = output_dir.joinpath(RAW_RESULTS_INDEX)
+    if not index_path.is_file():
+        return {}
+    raw_results = {}
+    with open(index_path) as index_file:
+        for line in index_file:
+            index_entry = json.loads(line)
+            raw_results[index_entry["sample_id"]] = output_dir.joinpath(index_entry["raw_result"])
+    index_file.close()
+    return raw_results
+
+
+def scan_raw_results(output_dir: Path) -> Dict[str, Path]:
+    """
+    Scan the output directory for the raw result of every sample.
+
+    Args:
+        output_dir (Path): Path to the output directory.
+
+    Returns:
+        Dict[str, Path]: The raw result path for each sample ID.
+    """
+    if not output_dir.is_dir():
+        return {}
+    raw_results = {}
+    for raw_result_path in sorted(output_dir.iterdir()):
+        sample_id = raw_result_sample_id(raw_result_path)
+        if sample_id is not None:
+            raw_results[sample_id] = raw_result_path
+    return raw_results
+
+
+def find_raw_results(output_dir: Path) -> Dict[str, Path]:
+    """
+    Find the raw result of every sample in the output directory.
+
+    The raw results index is used when it exists, otherwise the output directory is scanned.
+    Raw results written to the output directory outside a run are only found once
+    index_raw_results has added them to the index, which every run does before starting.
+
+    Args:
+        output_dir (Path): Path to the output directory.
+
+    Returns:
+        Dict[str, Path]: The raw result path for each sample ID.
+    """
+    if not output_dir.joinpath(RAW_RESULTS_INDEX).is_file():
+        return scan_raw_results(output_dir)
+    return {
+        sample_id: raw_result_path
+        for sample_id, raw_result_path in read_raw_results_index(output_dir).items()
+        if raw_result_path.is_file()
+    }
+
+
+def read_raw_result_bytes(raw_result_path: Path) -> bytes:
+    """
+    Read a raw result file, decompressing it if it is zstd compressed.
+
+    Args:
+        raw_result_path (Path): Path to the raw result file.
+
+    Returns:
+        bytes: The contents of the raw result file.
+    """
+    if raw_result_path.name.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError as err:
+            raise ImportError(
+                "Reading compressed raw results requires the zstd extra: "
+                "pip install pheval-ai-marrvel[zstd]"
+            ) from err
+        with zstandard.open(raw_result_path, "rb") as raw_result_file:
+            return raw_result_file.read()
+    return raw_result_path.read_bytes()
+
+
+def index_raw_results(output_dir: Path) -> None:
+    """
+    Record the raw results already in the output directory that are missing from
+    the raw results index, creating the index if the output directory has none yet.
+
+    Args:
+        output_dir (Path): Path to the output directory.
+    """
+    indexed_raw_results = read_raw_results_index(output_dir)
+    for sample_id, raw_result_path in scan_raw_results(output_dir).items():
+        if sample_id not in indexed_raw_results or not indexed_raw_results[sample_id].is_file():
+            write_index_entry(output_dir, sample_id, raw_result_path)
@@ -1,10 +1,12 @@
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
-from pheval.utils.file_utils import all_files
 from pheval.utils.phenopacket_utils import PhenopacketUtil, phenopacket_reader
 
+from pheval_ai_marrvel.constants import APPTAINER_MEMORY_GB
+from pheval_ai_marrvel.run.retry_policy import ResourceRequest
+
 
 @dataclass
 class ApptainerArguments:
@@ -62,23 +64,29 @@ def get_apptainer_arguments(
     )
 
 
-def create_apptainer_command(apptainer_arguments: ApptainerArguments) -> str:
+def create_apptainer_command(
+    apptainer_arguments: ApptainerArguments,
+    resources: Optional[ResourceRequest] = None,
+) -> str:
     """
     Create an apptainer command for running AI-MARRVEL for a sample.
 
     Args:
         apptainer_arguments(ApptainerArguments): Arguments for running AI-MARRVEL with apptainer.
+        resources (Optional[ResourceRequest]): Resources requested for running AI-MARRVEL,
+            the apptainer defaults are used if None.
 
     Returns:
         str: The string apptainer command.
     """
+    resources = resources or ResourceRequest(memory_gb=APPTAINER_MEMORY_GB)
     return (
         f"apptainer run --mount type=bind,source={apptainer_arguments.vcf_path},destination=/input/vcf.gz"
         f" --mount type=bind,source={apptainer_arguments.hpo_txt_file_path},destination=/input/hpo.txt"
         f" --mount type=bind,source={apptainer_arguments.data_dependencies},destination=/run/data_dependencies"
         f" --mount type=bind,source={apptainer_arguments.output_directory},destination=/out"
         f" docker://chaozhongliu/aim-lite /run/proc.sh {apptainer_arguments.sample_id}"
-        f" {apptainer_arguments.vcf_assembly} 32"
+        f" {apptainer_arguments.vcf_assembly} {resources.memory_gb or APPTAINER_MEMORY_GB}"
     )
 
 
@@ -100,8 +108,12 @@ def write_commands(commands: List[str], tool_input_commands_dir: Path, testdata_
 
 
 def create_apptainer_commands(
-    tool_input_commands_dir: Path, testdata_dir: Path, input_dir: Path, output_dir: Path
-) -> None:
+    tool_input_commands_dir: Path,
+    testdata_dir: Path,
+    input_dir: Path,
+    output_dir: Path,
+    phenopacket_paths: List[Path],
+) -> List[ApptainerArguments]:
     """
     Create apptainer commands for running AI-MARRVEL apptainer with a corpus.
 
@@ -110,11 +122,21 @@ def create_apptainer_commands(
         testdata_dir (Path): The testdata directory.
         input_dir (Path): The input directory.
         output_dir (Path): The output directory.
+        phenopacket_paths (List[Path]): The phenopacket paths to create commands for.
+
+    Returns:
+        List[ApptainerArguments]: The arguments for running AI-MARRVEL apptainer commands.
     """
-    all_commands = []
-    for phenopacket_path in all_files(testdata_dir.joinpath("phenopackets")):
-        apptainer_arguments = get_apptainer_arguments(
-            phenopacket_path, testdata_dir, input_dir, output_dir
-        )
-        all_commands.append(create_apptainer_command(apptainer_arguments))
-    write_commands(all_commands, tool_input_commands_dir, testdata_dir)
+    all_apptainer_arguments = [
+        get_apptainer_arguments(phenopacket_path, testdata_dir, input_dir, output_dir)
+        for phenopacket_path in phenopacket_paths
+    ]
+    write_commands(
+        [
+            create_apptainer_command(apptainer_arguments)
+            for apptainer_arguments in all_apptainer_arguments
+        ],
+        tool_input_commands_dir,
+        testdata_dir,
+    )
+    return all_apptainer_arguments
@@ -1,13 +1,30 @@
+import threading
+from collections import deque
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, List, Optional
 
-import docker
-from docker import DockerClient
-from pheval.utils.file_utils import all_files
 from pheval.utils.phenopacket_utils import PhenopacketUtil, phenopacket_reader
 
-from pheval_ai_marrvel.constants import DATA_DEPENDENCIES, HPO_TXT, OUTPUT_DIR, VCF_FILE
+from pheval_ai_marrvel.constants import (
+    AI_MARRVEL_IMAGE,
+    DATA_DEPENDENCIES,
+    DOCKER_MEMORY_GB,
+    HPO_TXT,
+    OUTPUT_DIR,
+    VCF_FILE,
+)
+from pheval_ai_marrvel.run.retry_policy import (
+    OOM_ERROR_PATTERNS,
+    AttemptOutcome,
+    ResourceRequest,
+    SampleTask,
+)
+
+if TYPE_CHECKING:
+    from docker import DockerClient
+    from docker.models.containers import Container
 
 
 @dataclass
@@ -89,15 +106,58 @@ def create_volumes(
     )
 
 
-def create_docker_command(sample_data: SampleData) -> List[str]:
+def create_docker_command(
+    sample_data: SampleData, resources: Optional[ResourceRequest] = None
+) -> List[str]:
     """
     Create docker command to run AI MARRVEL.
     Args:
         sample_data (SampleData): The sample data
+        resources (Optional[ResourceRequest]): Resources requested for running AI MARRVEL,
+            the docker defaults are used if None
     Returns:
         List[str]: The docker command to run AI MARRVEL
     """
-    return ["/run/proc.sh", sample_data.sample_id, sample_data.genome_assembly, "30G"]
+    resources = resources or ResourceRequest()
+    return [
+        "/run/proc.sh",
+        sample_data.sample_id,
+        sample_data.genome_assembly,
+        f"{resources.memory_gb or DOCKER_MEMORY_GB}G",
+    ]
+
+
+def stream_container_logs(
+    container: "Container", output_tail: deque, oom_reported: threading.Event
+) -> None:
+    """
+    Print the logs of a container, keeping the last lines of output.
+    Args:
+        container (Container): The container
+        output_tail (deque): The last lines of output
+        oom_reported (threading.Event): Set if any line reports a process killed for running out
+            of memory
+    """
+    for line in container.logs(stream=True):
+        print(line.strip())
+        decoded_line = line.decode(errors="replace").strip()
+        output_tail.append(decoded_line)
+        if OOM_ERROR_PATTERNS.search(decoded_line):
+            oom_reported.set()
+
+
+def kill_container(container: "Container") -> None:
+    """
+    Kill a container, reporting rather than raising if the docker daemon cannot be reached.
+    Args:
+        container (Container): The container
+    """
+    import requests
+
+    try:
+        container.kill()
+    except requests.exceptions.RequestException as err:
+        print(f"failed to kill container {container.id}: {err}")
 
 
 def run_docker_sample(
@@ -106,8 +166,11 @@ def run_docker_sample(
     data_dependencies: Path,
     hpo_txt: Path,
     output_dir: Path,
-    client: DockerClient,
-) -> None:
+    client: "DockerClient",
+    resources: Optional[ResourceRequest] = None,
+    timeout: Optional[float] = None,
+    image: str = AI_MARRVEL_IMAGE,
+) -> AttemptOutcome:
     """
     Run docker command for a sample.
     Args:
@@ -117,7 +180,17 @@ def run_docker_sample(
         hpo_txt (str): Path to hpo txt file
         output_dir (str): Path to output directory
         client (DockerClient): Docker client
+        resources (Optional[ResourceRequest]): Resources requested for running AI MARRVEL,
+            the docker defaults are used if None
+        timeout (Optional[float]): Wall-clock timeout in seconds after which the container is killed
+        image (str): The AI MARRVEL image
+    Returns:
+        AttemptOutcome: The outcome of running the container
     """
+    import docker
+    import requests
+
+    resources = resources or ResourceRequest()
     sample_data = get_sample_data(phenopacket_path, vcf_dir)
     docker_mounts = create_volumes(sample_data.vcf_name, data_dependencies, hpo_txt, output_dir)
     vol = [
@@ -126,32 +199,90 @@ def run_docker_sample(
         docker_mounts.data_dependencies,
         docker_mounts.output_dir,
     ]
-    docker_command = create_docker_command(sample_data)
-    container = client.containers.run(
-        "chaozhongliu/aim-lite",
-        " ".join(docker_command),
-        volumes=[x for x in vol if x is not None],
-        detach=True,
+    docker_command = create_docker_command(sample_data, resources)
+    try:
+        container = client.containers.run(
+            image,
+            " ".join(docker_command),
+            volumes=[x for x in vol if x is not None],
+            detach=True,
+        )
+    except docker.errors.APIError as err:
+        return AttemptOutcome(
+            exit_code=None,
+            error=str(err),
+            transient_error=err.is_server_error() or err.status_code == 429,
+        )
+    except requests.exceptions.RequestException as err:
+        return AttemptOutcome(exit_code=None, error=str(err), transient_error=True)
+    output_tail, oom_reported = deque(maxlen=50), threading.Event()
+    log_stream = threading.Thread(
+        target=stream_container_logs, args=(container, output_tail, oom_reported), daemon=True
+    )
+    log_stream.start()
+    try:
+        exit_code = container.wait(timeout=timeout)["StatusCode"]
+    except requests.exceptions.ReadTimeout:
+        kill_container(container)
+        return AttemptOutcome(exit_code=None, timed_out=True, output_tail=list(output_tail))
+    except requests.exceptions.RequestException as err:
+        kill_container(container)
+        return AttemptOutcome(
+            exit_code=None, error=str(err), transient_error=True, output_tail=list(output_tail)
+        )
+    log_stream.join()
+    container.reload()
+    return AttemptOutcome(
+        exit_code=exit_code,
+        oom_killed=container.attrs["State"].get("OOMKilled", False),
+        oom_reported=oom_reported.is_set(),
+        output_tail=list(output_tail),
     )
-    for line in container.logs(stream=True):
-        print(line.strip())
 
 
-def run_docker(testdata_dir: Path, input_dir: Path, output_dir: Path) -> None:
+def create_docker_tasks(
+    testdata_dir: Path,
+    input_dir: Path,
+    output_dir: Path,
+    phenopacket_paths: List[Path],
+    image: str = AI_MARRVEL_IMAGE,
+) -> List[SampleTask]:
     """
-    Run AI MARRVEL with docker on a corpus.
+    Create the tasks to run AI MARRVEL with docker on a corpus.
     Args:
         testdata_dir (Path): Path to test data directory
         input_dir (Path): Path to input directory
         output_dir (Path): Path to output directory
+        phenopacket_paths (List[Path]): Paths to the phenopackets to run
+        image (str): The AI MARRVEL image
+    Returns:
+        List[SampleTask]: The tasks for each sample
     """
+    try:
+        import docker
+    except ImportError as err:
+        raise ImportError(
+            "Running with docker requires the docker extra: pip install pheval-ai-marrvel[docker]"
+        ) from err
     client = docker.from_env()
-    for phenopacket_path in all_files(testdata_dir.joinpath("phenopackets")):
-        run_docker_sample(
-            phenopacket_path,
-            testdata_dir.joinpath("vcf"),
-            input_dir,
-            output_dir,
-            testdata_dir.joinpath(f"hpo_ids/{phenopacket_path.stem}.txt"),
-            client,
+    tasks = []
+    for phenopacket_path in phenopacket_paths:
+        sample_data = get_sample_data(phenopacket_path, testdata_dir.joinpath("vcf"))
+        tasks.append(
+            SampleTask(
+                sample_id=sample_data.sample_id,
+                execute=partial(
+                    run_docker_sample,
+                    phenopacket_path,
+                    testdata_dir.joinpath("vcf"),
+                    input_dir,
+                    testdata_dir.joinpath(f"hpo_ids/{phenopacket_path.stem}.txt"),
+                    output_dir,
+                    client,
+                    image=image,
+                ),
+                resources=ResourceRequest(memory_gb=DOCKER_MEMORY_GB),
+                vcf_size=Path(sample_data.vcf_name).stat().st_size,
+            )
         )
+    return tasks
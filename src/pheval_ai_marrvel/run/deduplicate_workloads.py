@@ -0,0 +1,134 @@
+import hashlib
+import shutil
+from collections import defaultdict
+from pathlib import Path
+from typing import Collection, Dict, List, Tuple
+
+from pheval.utils.phenopacket_utils import phenopacket_reader
+
+from pheval_ai_marrvel.prepare.prepare_input import obtain_observed_hpo_ids
+from pheval_ai_marrvel.raw_results import find_raw_results, index_raw_results, write_index_entry
+from pheval_ai_marrvel.run.retry_policy import SampleTask
+from pheval_ai_marrvel.validate.validate_inputs import SampleValidation
+
+
+def hash_file(file_path: Path) -> str:
+    """
+    Compute the SHA-256 hash of the contents of a file.
+
+    Args:
+        file_path (Path): Path to the file.
+
+    Returns:
+        str: The hex digest.
+    """
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            file_hash.update(chunk)
+    file.close()
+    return file_hash.hexdigest()
+
+
+def group_workloads(samples: List[SampleValidation]) -> List[List[SampleValidation]]:
+    """
+    Group samples running an identical AI-MARRVEL workload, i.e., with the same VCF contents,
+    observed HPO ids and genome assembly.
+
+    Only VCF files of samples sharing a VCF size, HPO ids and genome assembly with another
+    sample are hashed, as samples with a unique VCF size cannot share a workload.
+
+    Args:
+        samples (List[SampleValidation]): The validated samples.
+
+    Returns:
+        List[List[SampleValidation]]: The samples sharing each workload, in corpus order.
+    """
+    candidate_groups = defaultdict(list)
+    for sample in samples:
+        hpo_ids = obtain_observed_hpo_ids(phenopacket_reader(Path(sample.phenopacket_path)))
+        candidate_groups[
+            (sample.vcf_size, tuple(sorted(hpo_ids.split("\n"))), sample.genome_assembly)
+        ].append(sample)
+    vcf_hashes = {}
+    workloads = defaultdict(list)
+    for (_, hpo_ids, genome_assembly), candidates in candidate_groups.items():
+        for sample in candidates:
+            vcf_hash = sample.vcf_path
+            if len(candidates) > 1:
+                if sample.vcf_path not in vcf_hashes:
+                    vcf_hashes[sample.vcf_path] = hash_file(Path(sample.vcf_path))
+                vcf_hash = vcf_hashes[sample.vcf_path]
+            workloads[(vcf_hash, hpo_ids, genome_assembly)].append(sample)
+    corpus_order = {sample.phenopacket_path: index for index, sample in enumerate(samples)}
+    return sorted(
+        workloads.values(), key=lambda workload: corpus_order[workload[0].phenopacket_path]
+    )
+
+
+def deduplicate_tasks(
+    tasks: List[SampleTask],
+    samples: List[SampleValidation],
+    completed: Collection[str] = (),
+) -> Tuple[List[SampleTask], Dict[str, List[str]]]:
+    """
+    Keep a single task for each distinct workload.
+
+    A sample that already has results is preferred as the representative of its workload,
+    so that no workload is run again.
+
+    Args:
+        tasks (List[SampleTask]): The task for each sample.
+        samples (List[SampleValidation]): The validated samples, in the order of the tasks.
+        completed (Collection[str]): The IDs of the samples that already have results.
+
+    Returns:
+        Tuple[List[SampleTask], Dict[str, List[str]]]: The deduplicated tasks and the IDs of the
+            samples sharing the workload of each representative sample.
+    """
+    task_by_phenopacket = {sample.phenopacket_path: task for sample, task in zip(samples, tasks)}
+    deduplicated_tasks, duplicate_samples = [], {}
+    for workload in group_workloads(samples):
+        workload_tasks = [task_by_phenopacket[sample.phenopacket_path] for sample in workload]
+        representative = next(
+            (task for task in workload_tasks if task.sample_id in completed), workload_tasks[0]
+        )
+        deduplicated_tasks.append(representative)
+        if len(workload_tasks) > 1:
+            duplicate_samples[representative.sample_id] = [
+                task.sample_id for task in workload_tasks if task is not representative
+            ]
+    return deduplicated_tasks, duplicate_samples
+
+
+def fan_out_raw_results(duplicate_samples: Dict[str, List[str]], output_dir: Path) -> int:
+    """
+    Copy the raw result of each representative sample to the samples sharing its workload.
+    Samples sharing the workload of a representative sample without a raw result are left
+    without one.
+
+    Args:
+        duplicate_samples (Dict[str, List[str]]): The IDs of the samples sharing the workload
+            of each representative sample.
+        output_dir (Path): Path to the output directory.
+
+    Returns:
+        int: The number of raw results copied.
+    """
+    index_raw_results(output_dir)
+    raw_results = find_raw_results(output_dir)
+    copied = 0
+    for representative, members in duplicate_samples.items():
+        if representative not in raw_results:
+            print(f"no raw result for {representative}, not copying it to {', '.join(members)}")
+            continue
+        raw_result_path = raw_results[representative]
+        raw_result_suffix = raw_result_path.name[len(representative) :]
+        for member in members:
+            if member in raw_results:
+                continue
+            member_raw_result_path = output_dir.joinpath(f"{member}{raw_result_suffix}")
+            shutil.copyfile(raw_result_path, member_raw_result_path)
+            write_index_entry(output_dir, member, member_raw_result_path)
+            copied += 1
+    return copied
@@ -1,10 +1,11 @@
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
-from pheval.utils.file_utils import all_files
 from pheval.utils.phenopacket_utils import PhenopacketUtil, phenopacket_reader
 
+from pheval_ai_marrvel.run.retry_policy import ResourceRequest
+
 
 @dataclass
 class NextFlowParameters:
@@ -60,8 +61,21 @@ def get_next_flow_parameters(
     )
 
 
-def create_next_flow_command(next_flow_parameters: NextFlowParameters) -> str:
-    return (
+def create_next_flow_command(
+    next_flow_parameters: NextFlowParameters, resources: Optional[ResourceRequest] = None
+) -> str:
+    """
+    Create a next flow command for running AI-MARRVEL for a sample.
+    Args:
+        next_flow_parameters (NextFlowParameters): Parameters for running AI-MARRVEL with next flow.
+        resources (Optional[ResourceRequest]): Resources overriding the process defaults of the
+            workflow, the workflow defaults are used if None.
+
+    Returns:
+        str: The next flow command.
+    """
+    resources = resources or ResourceRequest()
+    next_flow_command = (
         f"nextflow run {next_flow_parameters.executable} "
         f"--ref_dir {next_flow_parameters.ref_dir} "
         f"--input_vcf {next_flow_parameters.input_vcf} "
@@ -70,6 +84,9 @@ def create_next_flow_command(next_flow_parameters: NextFlowParameters) -> str:
         f"--run_id {next_flow_parameters.sample_id} "
         f"--ref_ver {next_flow_parameters.reference_version}"
     )
+    if resources.memory_gb:
+        next_flow_command += f" -process.memory={resources.memory_gb}GB"
+    return next_flow_command
 
 
 def write_commands(commands: List[str], tool_input_commands_dir: Path, testdata_dir: Path) -> None:
@@ -90,8 +107,12 @@ def write_commands(commands: List[str], tool_input_commands_dir: Path, testdata_
 
 
 def create_nextflow_commands(
-    tool_input_commands_dir: Path, testdata_dir: Path, input_dir: Path, output_dir: Path
-) -> None:
+    tool_input_commands_dir: Path,
+    testdata_dir: Path,
+    input_dir: Path,
+    output_dir: Path,
+    phenopacket_paths: List[Path],
+) -> List[NextFlowParameters]:
     """
     Create nextflow commands for running AI-MARRVEL with a corpus.
 
@@ -100,11 +121,21 @@ def create_nextflow_commands(
         testdata_dir (Path): The testdata directory.
         input_dir (Path): The input directory.
         output_dir (Path): The output directory.
+        phenopacket_paths (List[Path]): The phenopacket paths to create commands for.
+
+    Returns:
+        List[NextFlowParameters]: The parameters for running AI-MARRVEL with next flow.
     """
-    all_commands = []
-    for phenopacket_path in all_files(testdata_dir.joinpath("phenopackets")):
-        next_flow_arguments = get_next_flow_parameters(
-            phenopacket_path, testdata_dir, input_dir, output_dir
-        )
-        all_commands.append(create_next_flow_command(next_flow_arguments))
-    write_commands(all_commands, tool_input_commands_dir, testdata_dir)
+    all_next_flow_parameters = [
+        get_next_flow_parameters(phenopacket_path, testdata_dir, input_dir, output_dir)
+        for phenopacket_path in phenopacket_paths
+    ]
+    write_commands(
+        [
+            create_next_flow_command(next_flow_parameters)
+            for next_flow_parameters in all_next_flow_parameters
+        ],
+        tool_input_commands_dir,
+        testdata_dir,
+    )
+    return all_next_flow_parameters
@@ -0,0 +1,191 @@
+import shutil
+import tarfile
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Collection, List, Optional
+
+from pheval_ai_marrvel.constants import RAW_RESULT_SUFFIX, RAW_RESULTS_INDEX
+from pheval_ai_marrvel.raw_results import raw_result_sample_id, write_index_entry
+
+ARCHIVE_SUFFIX = "_outputs.tar.gz"
+
+
+def import_zstandard() -> ModuleType:
+    """
+    Import zstandard, which is only installed with the zstd extra.
+
+    Returns:
+        ModuleType: The zstandard module.
+
+    Raises:
+        ImportError: If zstandard is not installed.
+    """
+    try:
+        import zstandard
+    except ImportError as err:
+        raise ImportError(
+            "Compressing raw results requires the zstd extra: pip install pheval-ai-marrvel[zstd]"
+        ) from err
+    return zstandard
+
+
+@dataclass
+class RetentionPolicy:
+    """
+    Policy for the AI-MARRVEL outputs retained once a sample has finished.
+
+    Attributes:
+        other_outputs (str): What to do with outputs other than the integrated CSV, i.e.,
+            keep/delete/archive. Archived outputs are written to a single tarball per sample.
+        compress (bool): Compress the integrated CSV with zstd.
+
+    Raises:
+        ImportError: If compression is requested and zstandard is not installed, so that the
+            run fails before any sample rather than once the first sample has finished.
+    """
+
+    other_outputs: str = "keep"
+    compress: bool = False
+
+    def __post_init__(self):
+        if self.compress:
+            import_zstandard()
+
+
+def obtain_other_outputs(
+    sample_id: str, output_dir: Path, sample_ids: Collection[str] = ()
+) -> List[Path]:
+    """
+    Obtain the outputs of a sample other than its integrated CSV.
+
+    Outputs are the entries of the output directory named after the sample ID. Entries named after
+    a longer sample ID sharing the same prefix belong to that sample and are excluded, as are the
+    raw results and output archives of any sample, so that the results of a sample missing from
+    the sample IDs are never selected.
+
+    Args:
+        sample_id (str): The sample ID.
+        output_dir (Path): Path to the output directory.
+        sample_ids (Collection[str]): The IDs of all samples of the corpus.
+
+    Returns:
+        List[Path]: The other outputs of the sample.
+    """
+    longer_sample_ids = [
+        other_sample_id
+        for other_sample_id in sample_ids
+        if other_sample_id != sample_id and other_sample_id.startswith(sample_id)
+    ]
+    other_outputs = []
+    for output_path in sorted(output_dir.iterdir()):
+        name = output_path.name
+        if (
+            name == RAW_RESULTS_INDEX
+            or name.endswith(ARCHIVE_SUFFIX)
+            or raw_result_sample_id(output_path) is not None
+        ):
+            continue
+        if name != sample_id and not any(
+            name.startswith(f"{sample_id}{separator}") for separator in "_.-"
+        ):
+            continue
+        if any(
+            name == other_sample_id
+            or any(name.startswith(f"{other_sample_id}{separator}") for separator in "_.-")
+            for other_sample_id in longer_sample_ids
+        ):
+            continue
+        other_outputs.append(output_path)
+    return other_outputs
+
+
+def compress_raw_result(raw_result_path: Path) -> Path:
+    """
+    Compress a raw result file with zstd, removing the uncompressed file.
+
+    Args:
+        raw_result_path (Path): Path to the raw result file.
+
+    Returns:
+        Path: Path to the compressed raw result file.
+    """
+    zstandard = import_zstandard()
+    compressed_path = raw_result_path.with_name(f"{raw_result_path.name}.zst")
+    with (
+        open(raw_result_path, "rb") as raw_result_file,
+        zstandard.open(compressed_path, "wb") as compressed_file,
+    ):
+        shutil.copyfileobj(raw_result_file, compressed_file)
+    raw_result_path.unlink()
+    return compressed_path
+
+
+def archive_outputs(sample_id: str, output_dir: Path, outputs: List[Path]) -> Path:
+    """
+    Archive the outputs of a sample into a single tarball, removing the archived outputs.
+
+    Args:
+        sample_id (str): The sample ID.
+        output_dir (Path): Path to the output directory.
+        outputs (List[Path]): The outputs to archive.
+
+    Returns:
+        Path: Path to the tarball.
+    """
+    archive_path = output_dir.joinpath(f"{sample_id}{ARCHIVE_SUFFIX}")
+    with tarfile.open(archive_path, "w:gz") as archive:
+        for output_path in outputs:
+            archive.add(output_path, arcname=output_path.name)
+    delete_outputs(outputs)
+    return archive_path
+
+
+def delete_outputs(outputs: List[Path]) -> None:
+    """
+    Delete outputs of a sample.
+
+    Args:
+        outputs (List[Path]): The outputs to delete.
+    """
+    for output_path in outputs:
+        if output_path.is_dir() and not output_path.is_symlink():
+            shutil.rmtree(output_path)
+        else:
+            output_path.unlink()
+
+
+def apply_retention_policy(
+    sample_id: str,
+    output_dir: Path,
+    retention_policy: RetentionPolicy,
+    sample_ids: Collection[str] = (),
+) -> Optional[Path]:
+    """
+    Apply the retention policy to the outputs of a finished sample and record its raw result
+    in the raw results index.
+
+    Args:
+        sample_id (str): The sample ID.
+        output_dir (Path): Path to the output directory.
+        retention_policy (RetentionPolicy): The retention policy.
+        sample_ids (Collection[str]): The IDs of all samples of the corpus.
+
+    Returns:
+        Optional[Path]: Path to the retained raw result, None if the sample wrote no raw result.
+    """
+    raw_result_path = output_dir.joinpath(f"{sample_id}{RAW_RESULT_SUFFIX}")
+    if not raw_result_path.is_file():
+        print(f"{sample_id} finished without writing {raw_result_path.name}")
+        return None
+    archive_path = None
+    if retention_policy.other_outputs != "keep":
+        other_outputs = obtain_other_outputs(sample_id, output_dir, sample_ids)
+        if retention_policy.other_outputs == "archive" and other_outputs:
+            archive_path = archive_outputs(sample_id, output_dir, other_outputs)
+        elif retention_policy.other_outputs == "delete":
+            delete_outputs(other_outputs)
+    if retention_policy.compress:
+        raw_result_path = compress_raw_result(raw_result_path)
+    write_index_entry(output_dir, sample_id, raw_result_path, archive_path)
+    return raw_result_path
@@ -0,0 +1,370 @@
+import json
+import re
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field, replace
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Collection, Dict, List, Optional
+
+TRANSIENT_ERROR_PATTERNS = re.compile(
+    r"toomanyrequests|TLS handshake timeout|i/o timeout|connection reset by peer|"
+    r"connection refused|temporary failure in name resolution|service unavailable|"
+    r"bad gateway|gateway timeout|unexpected EOF|net/http: request canceled",
+    re.IGNORECASE,
+)
+OOM_EXIT_CODES = {137, -9}
+OOM_ERROR_PATTERNS = re.compile(r"terminated with an error exit status \(137\)")
+
+
+class FailureType(Enum):
+    """Classification of a failed AI-MARRVEL attempt."""
+
+    OOM = "oom"
+    TIMEOUT = "timeout"
+    TRANSIENT = "transient"
+    PIPELINE = "pipeline"
+
+
+@dataclass(frozen=True)
+class ResourceRequest:
+    """
+    Resources requested for an AI-MARRVEL attempt.
+
+    Attributes:
+        memory_gb (Optional[int]): Memory in GB, the environment default is used if None.
+    """
+
+    memory_gb: Optional[int] = None
+
+
+@dataclass
+class AttemptOutcome:
+    """
+    Outcome of an AI-MARRVEL attempt, as reported by the executor.
+
+    Attributes:
+        exit_code (Optional[int]): The exit code, None if the attempt could not be started.
+        timed_out (bool): Whether the attempt was killed after exceeding the timeout.
+        oom_killed (bool): Whether the attempt was reported as killed for running out of memory.
+        oom_reported (bool): Whether the output of the attempt reported a process killed for
+            running out of memory, as matched by OOM_ERROR_PATTERNS while streaming the output.
+        error (Optional[str]): Error raised while starting or monitoring the attempt.
+        transient_error (bool): Whether the error is known by the executor to be transient.
+        output_tail (List[str]): The last lines of output of the attempt.
+    """
+
+    exit_code: Optional[int]
+    timed_out: bool = False
+    oom_killed: bool = False
+    oom_reported: bool = False
+    error: Optional[str] = None
+    transient_error: bool = False
+    output_tail: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Attempt:
+    """
+    Record of an AI-MARRVEL attempt for a sample.
+
+    Attributes:
+        attempt (int): The attempt number, starting at 1.
+        resources (ResourceRequest): The resources requested for the attempt.
+        duration (float): Wall-clock duration of the attempt in seconds.
+        exit_code (Optional[int]): The exit code of the attempt.
+        failure_type (Optional[FailureType]): The failure classification, None if successful.
+        error (Optional[str]): Error raised while starting or monitoring the attempt.
+    """
+
+    attempt: int
+    resources: ResourceRequest
+    duration: float
+    exit_code: Optional[int]
+    failure_type: Optional[FailureType]
+    error: Optional[str] = None
+
+
+@dataclass
+class SampleRunHistory:
+    """
+    Attempt history of AI-MARRVEL for a sample.
+
+    Attributes:
+        sample_id (str): The sample ID.
+        vcf_size (Optional[int]): The size of the VCF file in bytes.
+        attempts (List[Attempt]): The attempts made for the sample.
+    """
+
+    sample_id: str
+    vcf_size: Optional[int] = None
+    attempts: List[Attempt] = field(default_factory=list)
+
+    @property
+    def status(self) -> str:
+        """
+        Final status of the sample, separating genuine pipeline failures from infrastructure noise.
+
+        Returns:
+            str: One of succeeded, failed_pipeline or failed_infrastructure.
+        """
+        if not self.attempts or self.attempts[-1].failure_type is None:
+            return "succeeded"
+        if self.attempts[-1].failure_type == FailureType.PIPELINE:
+            return "failed_pipeline"
+        return "failed_infrastructure"
+
+
+@dataclass
+class SampleTask:
+    """
+    A sample to run with retries.
+
+    Attributes:
+        sample_id (str): The sample ID.
+        execute (Callable[[ResourceRequest, Optional[float]], AttemptOutcome]): Runs a single
+            attempt with the requested resources and timeout in seconds.
+        resources (ResourceRequest): The resources requested for the first attempt.
+        vcf_size (Optional[int]): The size of the VCF file in bytes.
+    """
+
+    sample_id: str
+    execute: Callable[[ResourceRequest, Optional[float]], AttemptOutcome]
+    resources: ResourceRequest = field(default_factory=ResourceRequest)
+    vcf_size: Optional[int] = None
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Policy for retrying failed AI-MARRVEL attempts.
+
+    Attributes:
+        max_retries (int): Maximum number of retries per sample.
+        timeout (Optional[float]): Per-attempt wall-clock timeout in seconds, None for no timeout.
+        backoff (float): Delay in seconds before the first retry of a transient failure.
+        backoff_factor (float): Multiplier applied to the delay for every further retry.
+        memory_escalation_factor (float): Multiplier applied to memory after an OOM failure.
+        oom_memory_gb (int): Memory requested after an OOM failure when no memory was requested.
+        max_memory_gb (int): Upper bound for escalated memory.
+    """
+
+    max_retries: int = 2
+    timeout: Optional[float] = None
+    backoff: float = 30.0
+    backoff_factor: float = 2.0
+    memory_escalation_factor: float = 2.0
+    oom_memory_gb: int = 64
+    max_memory_gb: int = 256
+
+    def escalate(self, resources: ResourceRequest) -> ResourceRequest:
+        """
+        Escalate the resources requested after an OOM failure.
+
+        Args:
+            resources (ResourceRequest): The resources of the failed attempt.
+
+        Returns:
+            ResourceRequest: The escalated resources.
+        """
+        memory_gb = (
+            int(resources.memory_gb * self.memory_escalation_factor)
+            if resources.memory_gb
+            else self.oom_memory_gb
+        )
+        return replace(resources, memory_gb=min(memory_gb, self.max_memory_gb))
+
+    def retry_delay(self, attempt: int, failure_type: FailureType) -> float:
+        """
+        Delay before retrying a failed attempt.
+
+        Args:
+            attempt (int): The number of the failed attempt.
+            failure_type (FailureType): The failure classification.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        if failure_type != FailureType.TRANSIENT:
+            return 0.0
+        return self.backoff * self.backoff_factor ** (attempt - 1)
+
+
+def classify_failure(outcome: AttemptOutcome) -> Optional[FailureType]:
+    """
+    Classify the outcome of an attempt.
+
+    Nextflow exits with status 1 when a process is killed for running out of memory,
+    so a failed attempt whose output reported the exit status of the process is also an OOM.
+
+    Args:
+        outcome (AttemptOutcome): The attempt outcome.
+
+    Returns:
+        Optional[FailureType]: The failure classification, None if the attempt succeeded.
+    """
+    if outcome.timed_out:
+        return FailureType.TIMEOUT
+    if outcome.oom_killed or outcome.exit_code in OOM_EXIT_CODES:
+        return FailureType.OOM
+    if outcome.exit_code == 0 and outcome.error is None:
+        return None
+    if outcome.oom_reported:
+        return FailureType.OOM
+    if outcome.transient_error or any(
+        TRANSIENT_ERROR_PATTERNS.search(line)
+        for line in [outcome.error or ""] + outcome.output_tail
+    ):
+        return FailureType.TRANSIENT
+    return FailureType.PIPELINE
+
+
+def run_with_retries(
+    tasks: List[SampleTask],
+    retry_policy: RetryPolicy,
+    on_success: Optional[Callable[[str], None]] = None,
+) -> List[SampleRunHistory]:
+    """
+    Run samples, retrying retryable failures and rescheduling them behind the remaining samples.
+
+    Args:
+        tasks (List[SampleTask]): The samples to run.
+        retry_policy (RetryPolicy): The retry policy.
+        on_success (Optional[Callable[[str], None]]): Called with the sample ID as soon as
+            a sample succeeds.
+
+    Returns:
+        List[SampleRunHistory]: The attempt history for each sample.
+    """
+    histories = {
+        task.sample_id: SampleRunHistory(sample_id=task.sample_id, vcf_size=task.vcf_size)
+        for task in tasks
+    }
+    queue = deque((task, task.resources, 0.0) for task in tasks)
+    while queue:
+        ready = next((entry for entry in queue if entry[2] <= time.monotonic()), None)
+        if ready is None:
+            time.sleep(max(0.0, min(entry[2] for entry in queue) - time.monotonic()))
+            continue
+        queue.remove(ready)
+        task, resources, _ = ready
+        history = histories[task.sample_id]
+        start = time.monotonic()
+        outcome = task.execute(resources, retry_policy.timeout)
+        failure_type = classify_failure(outcome)
+        history.attempts.append(
+            Attempt(
+                attempt=len(history.attempts) + 1,
+                resources=resources,
+                duration=time.monotonic() - start,
+                exit_code=outcome.exit_code,
+                failure_type=failure_type,
+                error=outcome.error,
+            )
+        )
+        if failure_type is None and on_success is not None:
+            on_success(task.sample_id)
+        if (
+            failure_type is None
+            or failure_type == FailureType.PIPELINE
+            or len(history.attempts) > retry_policy.max_retries
+        ):
+            continue
+        print(f"{task.sample_id} failed ({failure_type.value}), rescheduling")
+        if failure_type == FailureType.OOM:
+            resources = retry_policy.escalate(resources)
+        queue.append(
+            (
+                task,
+                resources,
+                time.monotonic() + retry_policy.retry_delay(len(history.attempts), failure_type),
+            )
+        )
+    return list(histories.values())
+
+
+def write_run_report(
+    histories: List[SampleRunHistory],
+    report_path: Path,
+    duplicate_samples: Optional[Dict[str, List[str]]] = None,
+    completed: Collection[str] = (),
+) -> None:
+    """
+    Write the attempt history of a corpus to a JSON file.
+
+    Samples sharing the workload of a representative sample were not run and inherit the status
+    of the representative, succeeded if the representative already had results. Only those
+    inheriting a successful outcome count as executions saved.
+
+    If a report already exists at the report path, the samples of this run are merged into it,
+    so that samples skipped by a resumed run keep the history recorded by previous runs.
+
+    Args:
+        histories (List[SampleRunHistory]): The attempt history for each sample.
+        report_path (Path): The report path.
+        duplicate_samples (Optional[Dict[str, List[str]]]): The IDs of the samples sharing the
+            workload of each representative sample, which were not run.
+        completed (Collection[str]): The IDs of the samples that already had results, which were
+            not run.
+    """
+    duplicate_samples = duplicate_samples or {}
+    recorded_samples, recorded_duplicate_samples = {}, {}
+    if report_path.is_file():
+        with open(report_path) as report_file:
+            recorded_report = json.load(report_file)
+        report_file.close()
+        recorded_samples = {sample["sample_id"]: sample for sample in recorded_report["samples"]}
+        recorded_duplicate_samples = recorded_report.get("duplicate_samples", {})
+    histories_by_sample = {history.sample_id: history for history in histories}
+    samples = [
+        {
+            "sample_id": history.sample_id,
+            "vcf_size": history.vcf_size,
+            "status": history.status,
+            "attempts": [
+                asdict(attempt)
+                | {"failure_type": (attempt.failure_type.value if attempt.failure_type else None)}
+                for attempt in history.attempts
+            ],
+        }
+        for history in histories
+    ]
+    for representative, members in duplicate_samples.items():
+        representative_history = histories_by_sample.get(representative)
+        for member in members:
+            if member in completed:
+                continue
+            samples.append(
+                {
+                    "sample_id": member,
+                    "vcf_size": representative_history.vcf_size if representative_history else None,
+                    "status": (
+                        representative_history.status if representative_history else "succeeded"
+                    ),
+                    "duplicate_of": representative,
+                    "attempts": [],
+                }
+            )
+    samples = list(
+        (recorded_samples | {sample["sample_id"]: sample for sample in samples}).values()
+    )
+    statuses = [sample["status"] for sample in samples]
+    report = {
+        "total_samples": len(samples),
+        "succeeded": statuses.count("succeeded"),
+        "succeeded_after_retry": sum(
+            1
+            for sample in samples
+            if sample["status"] == "succeeded" and len(sample["attempts"]) > 1
+        ),
+        "failed_pipeline": statuses.count("failed_pipeline"),
+        "failed_infrastructure": statuses.count("failed_infrastructure"),
+        "executions_saved": sum(
+            1 for sample in samples if "duplicate_of" in sample and sample["status"] == "succeeded"
+        ),
+        "duplicate_samples": recorded_duplicate_samples | duplicate_samples,
+        "samples": samples,
+    }
+    with open(report_path, "w") as report_file:
+        json.dump(report, report_file, indent=4)
+    report_file.close()
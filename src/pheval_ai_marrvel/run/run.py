@@ -1,46 +1,278 @@
+import os
+import signal
 import subprocess
+import threading
+from collections import deque
+from functools import partial
 from pathlib import Path
+from typing import Callable, List, Optional, Set
 
-from pheval_ai_marrvel.run.create_apptainer_commands import create_apptainer_commands
-from pheval_ai_marrvel.run.create_docker_commands import run_docker
-from pheval_ai_marrvel.run.prepare_next_flow_commands import create_nextflow_commands
+from pheval_ai_marrvel.constants import AI_MARRVEL_IMAGE, APPTAINER_MEMORY_GB
+from pheval_ai_marrvel.raw_results import find_raw_results, index_raw_results
+from pheval_ai_marrvel.run.create_apptainer_commands import (
+    create_apptainer_command,
+    create_apptainer_commands,
+)
+from pheval_ai_marrvel.run.deduplicate_workloads import deduplicate_tasks, fan_out_raw_results
+from pheval_ai_marrvel.run.prepare_next_flow_commands import (
+    create_next_flow_command,
+    create_nextflow_commands,
+)
+from pheval_ai_marrvel.run.retention_policy import RetentionPolicy, apply_retention_policy
+from pheval_ai_marrvel.run.retry_policy import (
+    OOM_ERROR_PATTERNS,
+    AttemptOutcome,
+    ResourceRequest,
+    RetryPolicy,
+    SampleTask,
+    run_with_retries,
+    write_run_report,
+)
+from pheval_ai_marrvel.validate.validate import validate_corpus
+from pheval_ai_marrvel.validate.validate_inputs import estimate_output_size
 
 
-def run_batch_file(testdata_dir: Path, tool_input_commands_dir: Path):
+def stream_process_output(
+    process: subprocess.Popen, output_tail: deque, oom_reported: threading.Event
+) -> None:
     """
-    Run the batch file for the corpus.
+    Print the output of a process, keeping the last lines of output.
     Args:
-        testdata_dir (Path): Path to the test data directory.
-        tool_input_commands_dir (Path): Path to the input commands directory.
+        process (subprocess.Popen): The process.
+        output_tail (deque): The last lines of output.
+        oom_reported (threading.Event): Set if any line reports a process killed for running out
+            of memory.
     """
-    batch_file = tool_input_commands_dir.joinpath(f"{testdata_dir.name}_commands.txt")
-    subprocess.run(
-        ["bash", str(batch_file)],
-        shell=False,
+    for line in process.stdout:
+        print(line, end="")
+        output_tail.append(line.strip())
+        if OOM_ERROR_PATTERNS.search(line):
+            oom_reported.set()
+
+
+def run_batch_command(command: str, timeout: Optional[float] = None) -> AttemptOutcome:
+    """
+    Run a single command of the batch file, killing it if it exceeds the timeout.
+    Args:
+        command (str): The command.
+        timeout (Optional[float]): Wall-clock timeout in seconds.
+
+    Returns:
+        AttemptOutcome: The outcome of running the command.
+    """
+    try:
+        process = subprocess.Popen(
+            ["bash", "-c", command],
+            shell=False,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+            start_new_session=True,
+        )
+    except OSError as err:
+        return AttemptOutcome(exit_code=None, error=str(err))
+    output_tail, oom_reported = deque(maxlen=50), threading.Event()
+    output_stream = threading.Thread(
+        target=stream_process_output, args=(process, output_tail, oom_reported), daemon=True
+    )
+    output_stream.start()
+    try:
+        exit_code = process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+        return AttemptOutcome(exit_code=None, timed_out=True, output_tail=list(output_tail))
+    output_stream.join()
+    return AttemptOutcome(
+        exit_code=exit_code, oom_reported=oom_reported.is_set(), output_tail=list(output_tail)
     )
 
 
-def run_commands(
+def create_batch_task(
+    sample_id: str,
+    create_command: Callable[[ResourceRequest], str],
+    resources: ResourceRequest,
+    vcf_path: Path,
+) -> SampleTask:
+    """
+    Create a task running the batch command for a sample.
+    Args:
+        sample_id (str): The sample ID.
+        create_command (Callable[[ResourceRequest], str]): Creates the command for the resources.
+        resources (ResourceRequest): The resources requested for the first attempt.
+        vcf_path (Path): Path to the VCF file of the sample.
+
+    Returns:
+        SampleTask: The sample task.
+    """
+    return SampleTask(
+        sample_id=sample_id,
+        execute=lambda requested_resources, timeout: run_batch_command(
+            create_command(requested_resources), timeout
+        ),
+        resources=resources,
+        vcf_size=Path(vcf_path).stat().st_size,
+    )
+
+
+def completed_sample_ids(output_dir: Path) -> Set[str]:
+    """
+    Obtain the IDs of the samples that already have AI-MARRVEL results in the output directory.
+    Args:
+        output_dir (Path): Path to the output directory.
+
+    Returns:
+        Set[str]: The completed sample IDs.
+    """
+    return set(find_raw_results(output_dir))
+
+
+def create_tasks(
     tool_input_commands_dir: Path,
     testdata_dir: Path,
     input_dir: Path,
     output_dir: Path,
     environment: str,
-) -> None:
+    phenopacket_paths: List[Path],
+    image: str = AI_MARRVEL_IMAGE,
+) -> List[SampleTask]:
     """
-    Run the apptainer commands.
+    Create the tasks running AI-MARRVEL in the environment for each sample.
 
     Args:
         tool_input_commands_dir (Path): Path to the tool input commands directory.
         testdata_dir (Path): Path to the test data directory.
         input_dir (Path): Path to the input directory.
         output_dir (Path): Path to the output directory.
+        environment (str): Environment to run AI-MARRVEL, i.e., apptainer/docker/nextflow.
+        phenopacket_paths (List[Path]): The phenopacket paths to create tasks for.
+        image (str): The AI-MARRVEL image run by the docker environment.
+
+    Returns:
+        List[SampleTask]: The task for each sample.
     """
+    tasks = []
     if environment.lower() == "apptainer":
-        create_apptainer_commands(tool_input_commands_dir, testdata_dir, input_dir, output_dir)
-        run_batch_file(testdata_dir, tool_input_commands_dir)
+        all_apptainer_arguments = create_apptainer_commands(
+            tool_input_commands_dir, testdata_dir, input_dir, output_dir, phenopacket_paths
+        )
+        tasks = [
+            create_batch_task(
+                apptainer_arguments.sample_id,
+                partial(create_apptainer_command, apptainer_arguments),
+                ResourceRequest(memory_gb=APPTAINER_MEMORY_GB),
+                apptainer_arguments.vcf_path,
+            )
+            for apptainer_arguments in all_apptainer_arguments
+        ]
     elif environment.lower() == "docker":
-        run_docker(testdata_dir, input_dir, output_dir)
+        from pheval_ai_marrvel.run.create_docker_commands import create_docker_tasks
+
+        tasks = create_docker_tasks(
+            testdata_dir, input_dir, output_dir, phenopacket_paths, image=image
+        )
     elif environment.lower() == "nextflow":
-        create_nextflow_commands(tool_input_commands_dir, testdata_dir, input_dir, output_dir)
-        run_batch_file(testdata_dir, tool_input_commands_dir)
+        all_next_flow_parameters = create_nextflow_commands(
+            tool_input_commands_dir, testdata_dir, input_dir, output_dir, phenopacket_paths
+        )
+        tasks = [
+            create_batch_task(
+                next_flow_parameters.sample_id,
+                partial(create_next_flow_command, next_flow_parameters),
+                ResourceRequest(),
+                next_flow_parameters.input_vcf,
+            )
+            for next_flow_parameters in all_next_flow_parameters
+        ]
+    return tasks
+
+
+def run_commands(
+    tool_input_commands_dir: Path,
+    testdata_dir: Path,
+    input_dir: Path,
+    output_dir: Path,
+    environment: str,
+    retry_policy: Optional[RetryPolicy] = None,
+    retention_policy: Optional[RetentionPolicy] = None,
+    deduplicate: bool = True,
+    image: str = AI_MARRVEL_IMAGE,
+) -> None:
+    """
+    Validate the inputs and run the commands for the samples that passed validation.
+
+    Samples sharing an identical workload are run once, the raw result is then copied to
+    every sample sharing the workload.
+
+    Args:
+        tool_input_commands_dir (Path): Path to the tool input commands directory.
+        testdata_dir (Path): Path to the test data directory.
+        input_dir (Path): Path to the input directory.
+        output_dir (Path): Path to the output directory.
+        environment (str): Environment to run AI-MARRVEL, i.e., apptainer/docker/nextflow.
+        retry_policy (Optional[RetryPolicy]): Policy for retrying failed samples, the default
+            policy is used if None.
+        retention_policy (Optional[RetentionPolicy]): Policy for the outputs retained once a sample
+            finishes, all outputs are kept if None.
+        deduplicate (bool): Run samples sharing an identical workload once.
+        image (str): The AI-MARRVEL image run by the docker environment.
+
+    Raises:
+        OSError: If the output directory does not have enough free disk space for the samples
+            that will be run, i.e., excluding completed samples and samples sharing a workload.
+    """
+    retry_policy = retry_policy or RetryPolicy()
+    retention_policy = retention_policy or RetentionPolicy()
+    validation_report = validate_corpus(
+        testdata_dir,
+        output_dir,
+        tool_input_commands_dir.joinpath(f"{testdata_dir.name}_validation_report.json"),
+    )
+    tasks = create_tasks(
+        tool_input_commands_dir,
+        testdata_dir,
+        input_dir,
+        output_dir,
+        environment,
+        validation_report.valid_phenopacket_paths(),
+        image,
+    )
+    index_raw_results(output_dir)
+    completed = completed_sample_ids(output_dir)
+    sample_ids = [task.sample_id for task in tasks]
+    corpus_sample_ids = {sample.sample_id for sample in validation_report.samples} | set(sample_ids)
+    duplicate_samples = {}
+    if deduplicate:
+        tasks, duplicate_samples = deduplicate_tasks(
+            tasks, validation_report.valid_samples, completed
+        )
+        if duplicate_samples:
+            print(f"deduplicated {len(sample_ids)} samples to {len(tasks)} distinct workloads")
+    for task in tasks:
+        if task.sample_id in completed:
+            print(f"skipping {task.sample_id}: results already exist in {output_dir}")
+    tasks = [task for task in tasks if task.sample_id not in completed]
+    expected_output_size = estimate_output_size(task.vcf_size or 0 for task in tasks)
+    if validation_report.free_disk_space < expected_output_size:
+        raise OSError(
+            f"Insufficient disk space in {output_dir}: {validation_report.free_disk_space} bytes "
+            f"free, {expected_output_size} bytes expected."
+        )
+    histories = run_with_retries(
+        tasks,
+        retry_policy,
+        on_success=partial(
+            apply_retention_policy,
+            output_dir=output_dir,
+            retention_policy=retention_policy,
+            sample_ids=corpus_sample_ids,
+        ),
+    )
+    fan_out_raw_results(duplicate_samples, output_dir)
+    write_run_report(
+        histories,
+        tool_input_commands_dir.joinpath(f"{testdata_dir.name}_run_report.json"),
+        duplicate_samples,
+        completed,
+    )
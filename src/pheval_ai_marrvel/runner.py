@@ -3,9 +3,6 @@ from pathlib import Path
 
 from pheval.runners.runner import PhEvalRunner
 
-from pheval_ai_marrvel.post_process.post_process import post_process_results
-from pheval_ai_marrvel.prepare.prepare import prepare_inputs
-from pheval_ai_marrvel.run.run import run_commands
 from pheval_ai_marrvel.tool_specific_configuration_options import AIMARRVELConfigurations
 
 
@@ -22,15 +19,46 @@ class AIMARRVELRunner(PhEvalRunner):
         """
         Pre-process phenopackets into tool accepted format.
         """
+        from pheval_ai_marrvel.prepare.prepare import prepare_inputs
+
         print("creating HPO txt files from phenopackets")
         prepare_inputs(testdata_dir=self.testdata_dir)
 
+    def plan(self):
+        """
+        Plan running AI-MARRVEL and estimate its cost, without running anything.
+        """
+        from pheval_ai_marrvel.plan.plan import plan_corpus, write_plan
+
+        print("planning AI-MARRVEL run")
+        config = AIMARRVELConfigurations.model_validate(
+            self.input_dir_config.tool_specific_configuration_options
+        )
+        plan_path = self.tool_input_commands_dir.joinpath(f"{self.testdata_dir.name}_plan.json")
+        write_plan(
+            plan_corpus(
+                testdata_dir=self.testdata_dir,
+                input_dir=self.input_dir,
+                output_dir=self.raw_results_dir,
+                environment=config.environment,
+                concurrency=config.concurrency,
+                history_dirs=[self.tool_input_commands_dir],
+                deduplicate=config.deduplicate_workloads,
+            ),
+            plan_path,
+        )
+        print(f"plan written to {plan_path}")
+
     def run(self):
         """
         Run AI-MARRVEL to produce the raw output.
         """
+        from pheval_ai_marrvel.run.retention_policy import RetentionPolicy
+        from pheval_ai_marrvel.run.retry_policy import RetryPolicy
+        from pheval_ai_marrvel.run.run import run_commands
+
         print("running with AI-MARRVEL")
-        config = AIMARRVELConfigurations.parse_config(
+        config = AIMARRVELConfigurations.model_validate(
             self.input_dir_config.tool_specific_configuration_options
         )
         run_commands(
@@ -39,14 +67,33 @@ class AIMARRVELRunner(PhEvalRunner):
             input_dir=self.input_dir,
             output_dir=self.raw_results_dir,
             environment=config.environment,
+            retry_policy=RetryPolicy(
+                max_retries=config.max_retries,
+                timeout=config.sample_timeout,
+                backoff=config.retry_backoff,
+                max_memory_gb=config.max_memory_gb,
+            ),
+            retention_policy=RetentionPolicy(
+                other_outputs=config.raw_output_retention,
+                compress=config.compress_raw_results,
+            ),
+            deduplicate=config.deduplicate_workloads,
         )
 
     def post_process(self):
         """
         Post-process the raw output into PhEval standardised TSV output.
         """
+        from pheval_ai_marrvel.post_process.post_process import post_process_results
+
         print("post processing results to PhEval standardised TSV output.")
+        config = AIMARRVELConfigurations.model_validate(
+            self.input_dir_config.tool_specific_configuration_options
+        )
         post_process_results(
             raw_results_dir=self.raw_results_dir,
             output_dir=self.output_dir,
+            top_k=config.top_k,
+            gene_aggregation=config.gene_aggregation,
+            gene_variant_counts=config.gene_variant_counts,
         )
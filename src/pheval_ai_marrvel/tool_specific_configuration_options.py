@@ -1,4 +1,8 @@
-from pydantic import BaseModel, Field
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from pheval_ai_marrvel.constants import GENE_AGGREGATIONS, RAW_OUTPUT_RETENTIONS
 
 
 class AIMARRVELConfigurations(BaseModel):
@@ -7,6 +11,41 @@ class AIMARRVELConfigurations(BaseModel):
     within the input_dir config.yaml
     Args:
         environment (str): Environment to run AI MARRVEL, i.e., docker/apptainer
+        top_k (Optional[int]): Only output the top-k scoring entries per sample in post-processing
+        gene_aggregation (Optional[str]): Reducer to aggregate variant scores per gene, i.e., max/sum/mean
+        gene_variant_counts (bool): Write the number of variants scored per aggregated gene,
+            requires gene_aggregation
+        max_retries (int): Maximum number of retries for a sample failing for a retryable reason
+        sample_timeout (Optional[float]): Wall-clock timeout in seconds for a single sample attempt
+        retry_backoff (float): Delay in seconds before retrying a transient failure, doubled per retry
+        max_memory_gb (int): Upper bound for memory escalated after out of memory failures
+        concurrency (int): Number of samples assumed to run concurrently when planning a run
+        raw_output_retention (str): Outputs other than the integrated CSV to keep/delete/archive
+        compress_raw_results (bool): Compress the integrated CSV of each sample with zstd
+        deduplicate_workloads (bool): Run samples sharing a VCF, HPO ids and assembly once
     """
 
     environment: str = Field(...)
+    top_k: Optional[int] = Field(None, ge=1)
+    gene_aggregation: Optional[Literal[tuple(GENE_AGGREGATIONS)]] = Field(None)
+    gene_variant_counts: bool = Field(False)
+    max_retries: int = Field(2, ge=0)
+    sample_timeout: Optional[float] = Field(None, gt=0)
+    retry_backoff: float = Field(30.0, ge=0)
+    max_memory_gb: int = Field(256, ge=1)
+    concurrency: int = Field(1, ge=1)
+    raw_output_retention: Literal[tuple(RAW_OUTPUT_RETENTIONS)] = Field("keep")
+    compress_raw_results: bool = Field(False)
+    deduplicate_workloads: bool = Field(True)
+
+    @model_validator(mode="after")
+    def check_gene_variant_counts(self) -> "AIMARRVELConfigurations":
+        """
+        Check that gene variant counts are only requested with a gene aggregation.
+
+        Returns:
+            AIMARRVELConfigurations: The validated configurations.
+        """
+        if self.gene_variant_counts and self.gene_aggregation is None:
+            raise ValueError("gene_variant_counts requires gene_aggregation to be set.")
+        return self
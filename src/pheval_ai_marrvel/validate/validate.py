@@ -0,0 +1,92 @@
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+import click
+
+if TYPE_CHECKING:
+    from pheval_ai_marrvel.validate.validate_inputs import ValidationReport
+
+
+def validate_corpus(
+    testdata_dir: Path, output_dir: Path, report_path: Path, max_workers: Optional[int] = None
+) -> "ValidationReport":
+    """
+    Validate the AI-MARRVEL inputs for a corpus and write a JSON validation report.
+
+    Args:
+        testdata_dir (Path): Path to the test data directory.
+        output_dir (Path): Path to the output directory.
+        report_path (Path): Path to write the validation report.
+        max_workers (Optional[int]): Maximum number of samples validated concurrently.
+
+    Returns:
+        ValidationReport: The validation report for the corpus.
+    """
+    from pheval.utils.file_utils import all_files
+
+    from pheval_ai_marrvel.validate.validate_inputs import validate_inputs
+
+    validation_report = validate_inputs(
+        all_files(testdata_dir.joinpath("phenopackets")), testdata_dir, output_dir, max_workers
+    )
+    validation_report.write_report(report_path)
+    for sample in validation_report.invalid_samples:
+        print(f"excluding {sample.sample_id}: {' '.join(sample.errors)}")
+    print(
+        f"{len(validation_report.valid_samples)}/{len(validation_report.samples)} samples passed "
+        f"validation, report written to {report_path}"
+    )
+    return validation_report
+
+
+@click.command()
+@click.option(
+    "--testdata-dir",
+    "-t",
+    type=Path,
+    required=True,
+    help="Path to the test data directory.",
+)
+@click.option(
+    "--output-dir",
+    "-o",
+    type=Path,
+    required=True,
+    help="Path to the output directory, checked for free disk space.",
+)
+@click.option(
+    "--report",
+    "-r",
+    type=Path,
+    required=True,
+    help="Path to write the JSON validation report.",
+)
+@click.option(
+    "--max-workers",
+    "-w",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Maximum number of samples validated concurrently.",
+)
+def validate(
+    testdata_dir: Path, output_dir: Path, report: Path, max_workers: Optional[int]
+) -> None:
+    """
+    Validate AI-MARRVEL inputs for a corpus before running.
+
+    Args:
+        testdata_dir (Path): Path to the test data directory.
+        output_dir (Path): Path to the output directory.
+        report (Path): Path to write the JSON validation report.
+        max_workers (Optional[int]): Maximum number of samples validated concurrently.
+
+    Exits with status 1 if any sample is invalid or there is insufficient disk space.
+    """
+    validation_report = validate_corpus(testdata_dir, output_dir, report, max_workers)
+    if not validation_report.sufficient_disk_space:
+        print(
+            f"insufficient disk space in {output_dir}: {validation_report.free_disk_space} bytes "
+            f"free, {validation_report.expected_output_size} bytes expected"
+        )
+    if validation_report.invalid_samples or not validation_report.sufficient_disk_space:
+        raise SystemExit(1)
@@ -0,0 +1,275 @@
+import gzip
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from pheval.utils.phenopacket_utils import PhenopacketUtil, phenopacket_reader
+
+GZIP_MAGIC = b"\x1f\x8b"
+BGZF_EOF = bytes.fromhex("1f8b08040000000000ff0600424302001b0003000000000000000000")
+SUPPORTED_GENOME_ASSEMBLIES = {"grch37": "hg19", "grch38": "hg38", "hg19": "hg19", "hg38": "hg38"}
+OUTPUT_SIZE_TO_VCF_SIZE_RATIO = 10
+
+
+@dataclass
+class SampleValidation:
+    """
+    Validation result of the inputs for a sample.
+
+    Attributes:
+        sample_id (str): The sample ID.
+        phenopacket_path (str): The phenopacket path.
+        vcf_path (Optional[str]): The VCF file path.
+        genome_assembly (Optional[str]): The genome assembly, as passed to AI-MARRVEL.
+        vcf_size (int): The size of the VCF file in bytes.
+        errors (List[str]): Errors that will cause AI-MARRVEL to fail for the sample.
+        warnings (List[str]): Issues that are not expected to cause AI-MARRVEL to fail.
+    """
+
+    sample_id: str
+    phenopacket_path: str
+    vcf_path: Optional[str] = None
+    genome_assembly: Optional[str] = None
+    vcf_size: int = 0
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+
+@dataclass
+class ValidationReport:
+    """
+    Validation report of the inputs for a corpus.
+
+    Attributes:
+        samples (List[SampleValidation]): The validation result for each sample.
+        free_disk_space (int): Free disk space in the output directory in bytes.
+        expected_output_size (int): Expected size of the output for the valid samples in bytes.
+    """
+
+    samples: List[SampleValidation]
+    free_disk_space: int
+    expected_output_size: int
+
+    @property
+    def valid_samples(self) -> List[SampleValidation]:
+        return [sample for sample in self.samples if sample.valid]
+
+    @property
+    def invalid_samples(self) -> List[SampleValidation]:
+        return [sample for sample in self.samples if not sample.valid]
+
+    @property
+    def sufficient_disk_space(self) -> bool:
+        return self.free_disk_space >= self.expected_output_size
+
+    def valid_phenopacket_paths(self) -> List[Path]:
+        """
+        Get the phenopacket paths of the samples that passed validation.
+
+        Returns:
+            List[Path]: The valid phenopacket paths.
+        """
+        return [Path(sample.phenopacket_path) for sample in self.valid_samples]
+
+    def write_report(self, report_path: Path) -> None:
+        """
+        Write the validation report to a JSON file.
+
+        Args:
+            report_path (Path): The report path.
+        """
+        report = {
+            "total_samples": len(self.samples),
+            "valid_samples": len(self.valid_samples),
+            "invalid_samples": len(self.invalid_samples),
+            "free_disk_space": self.free_disk_space,
+            "expected_output_size": self.expected_output_size,
+            "sufficient_disk_space": self.sufficient_disk_space,
+            "samples": [asdict(sample) | {"valid": sample.valid} for sample in self.samples],
+        }
+        with open(report_path, "w") as report_file:
+            json.dump(report, report_file, indent=4)
+        report_file.close()
+
+
+def check_readable_file(file_path: Path) -> Optional[str]:
+    """
+    Check that a file exists and is readable.
+
+    Args:
+        file_path (Path): The file path.
+
+    Returns:
+        Optional[str]: The error, if the file is not readable.
+    """
+    if not file_path.is_file():
+        return f"{file_path} does not exist."
+    if not os.access(file_path, os.R_OK):
+        return f"{file_path} is not readable."
+    return None
+
+
+def check_bgzip_integrity(vcf_path: Path) -> List[str]:
+    """
+    Check that a VCF is bgzip compressed, not truncated and has a valid VCF header.
+
+    Args:
+        vcf_path (Path): The VCF file path.
+
+    Returns:
+        List[str]: The errors found in the VCF file.
+    """
+    with open(vcf_path, "rb") as vcf_file:
+        block_header = vcf_file.read(18)
+        if len(block_header) < 18 or block_header[:2] != GZIP_MAGIC:
+            return [f"{vcf_path} is not gzip compressed."]
+        if block_header[12:14] != b"BC":
+            return [f"{vcf_path} is not bgzip compressed."]
+        vcf_file.seek(-len(BGZF_EOF), os.SEEK_END)
+        errors = [] if vcf_file.read() == BGZF_EOF else [f"{vcf_path} is truncated."]
+    try:
+        with gzip.open(vcf_path, "rt") as vcf:
+            if not vcf.readline().startswith("##fileformat=VCF"):
+                return errors + [f"{vcf_path} is missing the ##fileformat VCF header line."]
+            for line in vcf:
+                if line.startswith("#CHROM"):
+                    return errors
+                if not line.startswith("##"):
+                    break
+    except (OSError, EOFError, UnicodeDecodeError) as err:
+        return errors + [f"{vcf_path} is corrupt: {err}"]
+    return errors + [f"{vcf_path} is missing the #CHROM VCF header line."]
+
+
+def check_hpo_ids(hpo_txt_path: Path) -> Optional[str]:
+    """
+    Check that the HPO txt file contains at least one HPO id.
+
+    Args:
+        hpo_txt_path (Path): The hpo txt file path.
+
+    Returns:
+        Optional[str]: The error, if the HPO txt file is unreadable or empty.
+    """
+    error = check_readable_file(hpo_txt_path)
+    if error:
+        return error
+    with open(hpo_txt_path) as hpo_txt:
+        if not any(line.strip().startswith("HP:") for line in hpo_txt):
+            return f"{hpo_txt_path} does not contain any HPO ids."
+    return None
+
+
+def validate_sample(phenopacket_path: Path, testdata_dir: Path) -> SampleValidation:
+    """
+    Validate the inputs for a sample.
+
+    Args:
+        phenopacket_path (Path): The phenopacket path.
+        testdata_dir (Path): The testdata directory.
+
+    Returns:
+        SampleValidation: The validation result for the sample.
+    """
+    sample_validation = SampleValidation(
+        sample_id=phenopacket_path.stem, phenopacket_path=str(phenopacket_path)
+    )
+    hpo_error = check_hpo_ids(testdata_dir.joinpath(f"hpo_ids/{phenopacket_path.stem}.txt"))
+    if hpo_error:
+        sample_validation.errors.append(hpo_error)
+    try:
+        vcf_file_data = PhenopacketUtil(phenopacket_reader(phenopacket_path)).vcf_file_data(
+            phenopacket_path, testdata_dir.joinpath("vcf")
+        )
+    except Exception as err:
+        sample_validation.errors.append(f"Unable to obtain VCF file data: {err!r}")
+        return sample_validation
+    genome_assembly = vcf_file_data.file_attributes["genomeAssembly"]
+    sample_validation.genome_assembly = SUPPORTED_GENOME_ASSEMBLIES.get(genome_assembly.lower())
+    if sample_validation.genome_assembly is None:
+        sample_validation.errors.append(f"Unsupported genome assembly {genome_assembly}.")
+    vcf_path = Path(vcf_file_data.uri)
+    sample_validation.vcf_path = str(vcf_path)
+    vcf_error = check_readable_file(vcf_path)
+    if vcf_error:
+        sample_validation.errors.append(vcf_error)
+        return sample_validation
+    sample_validation.vcf_size = vcf_path.stat().st_size
+    sample_validation.errors.extend(check_bgzip_integrity(vcf_path))
+    if not any(
+        vcf_path.with_name(vcf_path.name + index_suffix).is_file()
+        for index_suffix in [".tbi", ".csi"]
+    ):
+        sample_validation.warnings.append(f"{vcf_path} is not indexed.")
+    return sample_validation
+
+
+def obtain_free_disk_space(output_dir: Path) -> int:
+    """
+    Obtain the free disk space for the output directory.
+
+    Args:
+        output_dir (Path): The output directory.
+
+    Returns:
+        int: The free disk space in bytes.
+    """
+    output_dir = output_dir.absolute()
+    while not output_dir.exists():
+        output_dir = output_dir.parent
+    return shutil.disk_usage(output_dir).free
+
+
+def estimate_output_size(vcf_sizes: Iterable[int]) -> int:
+    """
+    Estimate the size of the AI-MARRVEL output for samples from the sizes of their VCF files.
+
+    Args:
+        vcf_sizes (Iterable[int]): The sizes of the VCF files in bytes.
+
+    Returns:
+        int: The expected output size in bytes.
+    """
+    return sum(vcf_size * OUTPUT_SIZE_TO_VCF_SIZE_RATIO for vcf_size in vcf_sizes)
+
+
+def validate_inputs(
+    phenopacket_paths: List[Path],
+    testdata_dir: Path,
+    output_dir: Path,
+    max_workers: Optional[int] = None,
+) -> ValidationReport:
+    """
+    Validate the inputs for a corpus in parallel.
+
+    Args:
+        phenopacket_paths (List[Path]): The phenopacket paths.
+        testdata_dir (Path): The testdata directory.
+        output_dir (Path): The output directory.
+        max_workers (Optional[int]): Maximum number of samples validated concurrently.
+
+    Returns:
+        ValidationReport: The validation report for the corpus.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        samples = list(
+            executor.map(
+                lambda phenopacket_path: validate_sample(phenopacket_path, testdata_dir),
+                phenopacket_paths,
+            )
+        )
+    return ValidationReport(
+        samples=samples,
+        free_disk_space=obtain_free_disk_space(output_dir),
+        expected_output_size=estimate_output_size(
+            sample.vcf_size for sample in samples if sample.valid
+        ),
+    )
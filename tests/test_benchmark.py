@@ -0,0 +1,100 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from pheval_ai_marrvel.benchmark.benchmark import create_synthetic_corpus, run_benchmark
+from pheval_ai_marrvel.benchmark.stand_in import (
+    StandInProfile,
+    parse_apptainer_arguments,
+    parse_nextflow_arguments,
+    run_stand_in,
+)
+from pheval_ai_marrvel.post_process.post_process_results_format import read_raw_result
+from pheval_ai_marrvel.run.create_apptainer_commands import (
+    ApptainerArguments,
+    create_apptainer_command,
+)
+from pheval_ai_marrvel.run.prepare_next_flow_commands import (
+    NextFlowParameters,
+    create_next_flow_command,
+)
+
+
+class TestStandIn(unittest.TestCase):
+    def test_parse_apptainer_arguments(self):
+        command = create_apptainer_command(
+            ApptainerArguments(
+                sample_id="P1",
+                vcf_path=Path("/data/P1.vcf.gz"),
+                vcf_assembly="hg38",
+                hpo_txt_file_path=Path("/data/P1.txt"),
+                data_dependencies=Path("/data/dependencies"),
+                output_directory=Path("/data/out"),
+            )
+        )
+        self.assertEqual(
+            parse_apptainer_arguments(command.split()[1:]),
+            {
+                "vcf_path": "/data/P1.vcf.gz",
+                "hpo_txt": "/data/P1.txt",
+                "output_dir": "/data/out",
+                "sample_id": "P1",
+            },
+        )
+
+    def test_parse_nextflow_arguments(self):
+        command = create_next_flow_command(
+            NextFlowParameters(
+                executable=Path("/data/AI_MARRVEL/main.nf"),
+                ref_dir=Path("/data"),
+                input_vcf=Path("/data/P1.vcf.gz"),
+                input_hpo=Path("/data/P1.txt"),
+                output_dir=Path("/data/out"),
+                sample_id="P1",
+                reference_version="hg38",
+            )
+        )
+        self.assertEqual(
+            parse_nextflow_arguments(command.split()[1:]),
+            {
+                "vcf_path": "/data/P1.vcf.gz",
+                "hpo_txt": "/data/P1.txt",
+                "output_dir": "/data/out",
+                "sample_id": "P1",
+            },
+        )
+
+    def test_run_stand_in(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            testdata_dir, output_dir = Path(tmp_dir).joinpath("corpus"), Path(tmp_dir)
+            create_synthetic_corpus(testdata_dir, 1, variants=50)
+            exit_code = run_stand_in(
+                "sample_00000",
+                testdata_dir.joinpath("vcf/sample_00000.vcf.gz"),
+                testdata_dir.joinpath("hpo_ids/sample_00000.txt"),
+                output_dir,
+                StandInProfile(log_lines=0),
+            )
+            self.assertEqual(exit_code, 0)
+            raw_result = read_raw_result(output_dir.joinpath("sample_00000_integrated.csv"))
+            self.assertEqual(raw_result.height, 50)
+            self.assertEqual(raw_result["ranking"].to_list(), list(range(1, 51)))
+
+
+class TestRunBenchmark(unittest.TestCase):
+    def test_run_benchmark(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            results = run_benchmark(
+                Path(tmp_dir),
+                ["apptainer", "nextflow"],
+                [2],
+                [1, 2],
+                StandInProfile(log_lines=0),
+                variants=20,
+            )
+        self.assertEqual(
+            [(result.environment, result.concurrency) for result in results],
+            [("apptainer", 1), ("apptainer", 2), ("nextflow", 1), ("nextflow", 2)],
+        )
+        self.assertTrue(all(result.succeeded == 2 for result in results))
+        self.assertTrue(all(result.speedup is not None for result in results))
@@ -0,0 +1,114 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from pheval.utils.file_utils import all_files
+
+from pheval_ai_marrvel.benchmark.benchmark import create_synthetic_corpus, stand_in_environment
+from pheval_ai_marrvel.benchmark.stand_in import StandInProfile
+from pheval_ai_marrvel.raw_results import find_raw_results
+from pheval_ai_marrvel.run.deduplicate_workloads import group_workloads
+from pheval_ai_marrvel.run.run import run_commands
+from pheval_ai_marrvel.validate.validate_inputs import validate_inputs
+
+
+def copy_phenopacket(
+    testdata_dir: Path, sample_id: str, copy_id: str, vcf_name: str = None, hpo_ids: list = None
+) -> None:
+    phenopacket = json.loads(testdata_dir.joinpath(f"phenopackets/{sample_id}.json").read_text())
+    phenopacket["id"] = phenopacket["subject"]["id"] = copy_id
+    if vcf_name:
+        vcf_path = testdata_dir.joinpath(f"vcf/{vcf_name}")
+        shutil.copyfile(testdata_dir.joinpath(f"vcf/{sample_id}.vcf.gz"), vcf_path)
+        phenopacket["files"][0]["uri"] = str(vcf_path)
+    if hpo_ids:
+        phenopacket["phenotypicFeatures"] = [{"type": {"id": hpo_id}} for hpo_id in hpo_ids]
+    testdata_dir.joinpath(f"phenopackets/{copy_id}.json").write_text(json.dumps(phenopacket))
+    hpo_txt = testdata_dir.joinpath(f"hpo_ids/{sample_id}.txt").read_text()
+    testdata_dir.joinpath(f"hpo_ids/{copy_id}.txt").write_text(
+        "\n".join(hpo_ids) if hpo_ids else hpo_txt
+    )
+
+
+class TestDeduplicateWorkloads(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.testdata_dir = Path(self.tmp_dir.name).joinpath("corpus")
+        create_synthetic_corpus(self.testdata_dir, 2, variants=20)
+        copy_phenopacket(self.testdata_dir, "sample_00000", "sample_00000_relabelled")
+        copy_phenopacket(
+            self.testdata_dir, "sample_00000", "sample_00000_copy", vcf_name="copy.vcf.gz"
+        )
+        copy_phenopacket(
+            self.testdata_dir, "sample_00000", "sample_00000_other_hpo", hpo_ids=["HP:0000001"]
+        )
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_group_workloads(self):
+        samples = validate_inputs(
+            all_files(self.testdata_dir.joinpath("phenopackets")),
+            self.testdata_dir,
+            Path(self.tmp_dir.name),
+        ).valid_samples
+        self.assertEqual(
+            [[sample.sample_id for sample in workload] for workload in group_workloads(samples)],
+            [
+                ["sample_00000", "sample_00000_copy", "sample_00000_relabelled"],
+                ["sample_00000_other_hpo"],
+                ["sample_00001"],
+            ],
+        )
+
+    def run_commands(self, profile: StandInProfile) -> dict:
+        run_dir = Path(self.tmp_dir.name)
+        self.output_dir = run_dir.joinpath("out")
+        tool_input_commands_dir = run_dir.joinpath("commands")
+        self.output_dir.mkdir()
+        tool_input_commands_dir.mkdir()
+        with stand_in_environment(run_dir.joinpath("bin"), profile):
+            run_commands(
+                tool_input_commands_dir, self.testdata_dir, run_dir, self.output_dir, "apptainer"
+            )
+        with open(tool_input_commands_dir.joinpath("corpus_run_report.json")) as run_report_file:
+            return json.load(run_report_file)
+
+    def test_run_commands(self):
+        run_report = self.run_commands(StandInProfile(log_lines=0))
+        self.assertEqual(
+            sorted(find_raw_results(self.output_dir)),
+            [
+                "sample_00000",
+                "sample_00000_copy",
+                "sample_00000_other_hpo",
+                "sample_00000_relabelled",
+                "sample_00001",
+            ],
+        )
+        self.assertEqual(run_report["total_samples"], 5)
+        self.assertEqual(run_report["succeeded"], 5)
+        self.assertEqual(run_report["executions_saved"], 2)
+        self.assertEqual(
+            run_report["duplicate_samples"],
+            {"sample_00000": ["sample_00000_copy", "sample_00000_relabelled"]},
+        )
+        self.assertEqual(
+            [
+                (sample["sample_id"], sample["status"], sample.get("duplicate_of"))
+                for sample in run_report["samples"][-2:]
+            ],
+            [
+                ("sample_00000_copy", "succeeded", "sample_00000"),
+                ("sample_00000_relabelled", "succeeded", "sample_00000"),
+            ],
+        )
+
+    def test_run_commands_failed_representative(self):
+        run_report = self.run_commands(StandInProfile(log_lines=0, exit_code=1))
+        self.assertEqual(find_raw_results(self.output_dir), {})
+        self.assertEqual(run_report["total_samples"], 5)
+        self.assertEqual(run_report["failed_pipeline"], 5)
+        self.assertEqual(run_report["executions_saved"], 0)
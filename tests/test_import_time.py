@@ -0,0 +1,53 @@
+import subprocess
+import sys
+import unittest
+from typing import Dict
+
+HEAVY_MODULES = [
+    "docker",
+    "pandas",
+    "phenopackets",
+    "pheval.post_processing.post_processing",
+    "pheval.utils.file_utils",
+    "polars",
+]
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Args:
+        module (str): The module to import.
+
+    Returns:
+        Dict[str, int]: The cumulative import time in microseconds of every module imported.
+    """
+    importtime = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative_times = {}
+    for line in importtime.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, imported_module = line.split("|")
+        cumulative_times[imported_module.strip()] = int(cumulative)
+    return cumulative_times
+
+
+class TestImportTime(unittest.TestCase):
+    def assert_no_heavy_imports(self, module: str) -> None:
+        cumulative_times = import_times(module)
+        self.assertEqual(
+            [heavy_module for heavy_module in HEAVY_MODULES if heavy_module in cumulative_times],
+            [],
+        )
+
+    def test_cli_import_time(self):
+        self.assert_no_heavy_imports("pheval_ai_marrvel.cli")
+
+    def test_runner_import_time(self):
+        self.assert_no_heavy_imports("pheval_ai_marrvel.runner")
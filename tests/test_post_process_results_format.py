@@ -1,7 +1,79 @@
 import unittest
 
+import polars as pl
+from click.testing import CliRunner
+
+from pheval_ai_marrvel.post_process.post_process import post_process
+from pheval_ai_marrvel.post_process.post_process_results_format import (
+    aggregate_gene_results,
+    select_top_k,
+)
+
 
 class TestDummy(unittest.TestCase):
 
     def test_dummy(self):
         pass
+
+
+class TestSelectTopK(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.raw_result = pl.DataFrame(
+            {
+                "variant": ["1-100-A-G", "1-200-C-T", "2-300-G-A", "3-400-T-C", "4-500-A-C"],
+                "predict": [0.9, 0.5, 0.7, 0.5, 0.1],
+            }
+        )
+
+    def test_select_top_k(self):
+        self.assertEqual(
+            select_top_k(self.raw_result, 2)["variant"].to_list(), ["1-100-A-G", "2-300-G-A"]
+        )
+
+    def test_select_top_k_retains_ties(self):
+        self.assertEqual(
+            select_top_k(self.raw_result, 3)["variant"].to_list(),
+            ["1-100-A-G", "1-200-C-T", "2-300-G-A", "3-400-T-C"],
+        )
+
+    def test_select_top_k_exceeds_height(self):
+        self.assertTrue(select_top_k(self.raw_result, 10).equals(self.raw_result))
+
+
+class TestAggregateGeneResults(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.raw_result = pl.DataFrame(
+            {
+                "variant": ["1-100-A-G", "1-200-C-T", "2-300-G-A"],
+                "predict": [0.9, 0.5, 0.3],
+                "groupedGeneSymbol": [["GENE1"], ["GENE1", "GENE2"], ["GENE2"]],
+            }
+        )
+
+    def test_aggregate_gene_results_max(self):
+        self.assertEqual(
+            aggregate_gene_results(self.raw_result, "max").rows(),
+            [("GENE1", 0.9, 2), ("GENE2", 0.5, 2)],
+        )
+
+    def test_aggregate_gene_results_sum(self):
+        aggregated_gene_result = aggregate_gene_results(self.raw_result, "sum")
+        self.assertEqual(aggregated_gene_result["geneSymbol"].to_list(), ["GENE1", "GENE2"])
+        self.assertAlmostEqual(aggregated_gene_result["predict"][0], 1.4)
+        self.assertAlmostEqual(aggregated_gene_result["predict"][1], 0.8)
+
+    def test_aggregate_gene_results_mean(self):
+        aggregated_gene_result = aggregate_gene_results(self.raw_result, "mean")
+        self.assertAlmostEqual(aggregated_gene_result["predict"][0], 0.7)
+        self.assertAlmostEqual(aggregated_gene_result["predict"][1], 0.4)
+
+
+class TestPostProcess(unittest.TestCase):
+    def test_gene_variant_counts_requires_gene_aggregation(self):
+        result = CliRunner().invoke(
+            post_process, ["-r", "raw_results", "-o", "output", "--gene-variant-counts"]
+        )
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn("--gene-variant-counts requires --gene-aggregation", result.output)
@@ -0,0 +1,142 @@
+import json
+import sys
+import tarfile
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from pheval_ai_marrvel.post_process.post_process_results_format import read_raw_result
+from pheval_ai_marrvel.raw_results import find_raw_results, index_raw_results
+from pheval_ai_marrvel.run.retention_policy import (
+    RetentionPolicy,
+    apply_retention_policy,
+    obtain_other_outputs,
+)
+
+RAW_RESULT = (
+    "Unnamed: 0,predict,geneSymbol,ranking\n"
+    "1-100-A-G,0.9,GENE1,1\n"
+    "1-100-A-G,0.9,GENE2,1\n"
+    "2-300-G-A,0.3,GENE3,2\n"
+)
+
+
+class TestApplyRetentionPolicy(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = Path(self.tmp_dir.name)
+        for sample_id in ["P1", "P10"]:
+            self.output_dir.joinpath(f"{sample_id}_integrated.csv").write_text(RAW_RESULT)
+            self.output_dir.joinpath(f"{sample_id}_scores.txt").write_text("scores")
+            self.output_dir.joinpath(f"{sample_id}-vep").mkdir()
+            self.output_dir.joinpath(f"{sample_id}-vep", "annotated.vcf").write_text("vcf")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_obtain_other_outputs(self):
+        self.assertEqual(
+            [
+                output_path.name
+                for output_path in obtain_other_outputs("P1", self.output_dir, ["P1", "P10"])
+            ],
+            ["P1-vep", "P1_scores.txt"],
+        )
+
+    def test_obtain_other_outputs_other_sample_results(self):
+        self.output_dir.joinpath("P1_retest_integrated.csv").write_text(RAW_RESULT)
+        self.output_dir.joinpath("P1_retest_integrated.csv.zst").write_text(RAW_RESULT)
+        self.output_dir.joinpath("P1_retest_outputs.tar.gz").write_text("archive")
+        self.output_dir.joinpath("P1_retest_scores.txt").write_text("scores")
+        self.assertEqual(
+            [
+                output_path.name
+                for output_path in obtain_other_outputs(
+                    "P1", self.output_dir, ["P1", "P10", "P1_retest"]
+                )
+            ],
+            ["P1-vep", "P1_scores.txt"],
+        )
+        self.assertEqual(
+            [
+                output_path.name
+                for output_path in obtain_other_outputs("P1", self.output_dir, ["P1"])
+            ],
+            ["P1-vep", "P1_retest_scores.txt", "P1_scores.txt"],
+        )
+
+    def test_apply_retention_policy_keep(self):
+        raw_result_path = apply_retention_policy("P1", self.output_dir, RetentionPolicy())
+        self.assertEqual(raw_result_path, self.output_dir.joinpath("P1_integrated.csv"))
+        self.assertTrue(self.output_dir.joinpath("P1_scores.txt").exists())
+
+    def test_apply_retention_policy_delete(self):
+        apply_retention_policy(
+            "P1", self.output_dir, RetentionPolicy(other_outputs="delete"), ["P1", "P10"]
+        )
+        self.assertEqual(
+            sorted(path.name for path in self.output_dir.iterdir()),
+            [
+                "P10-vep",
+                "P10_integrated.csv",
+                "P10_scores.txt",
+                "P1_integrated.csv",
+                "raw_results_index.jsonl",
+            ],
+        )
+
+    def test_apply_retention_policy_archive_and_compress(self):
+        raw_result_path = apply_retention_policy(
+            "P1",
+            self.output_dir,
+            RetentionPolicy(other_outputs="archive", compress=True),
+            ["P1", "P10"],
+        )
+        self.assertEqual(raw_result_path, self.output_dir.joinpath("P1_integrated.csv.zst"))
+        self.assertFalse(self.output_dir.joinpath("P1_integrated.csv").exists())
+        self.assertFalse(self.output_dir.joinpath("P1-vep").exists())
+        with tarfile.open(self.output_dir.joinpath("P1_outputs.tar.gz")) as archive:
+            self.assertEqual(
+                sorted(archive.getnames()), ["P1-vep", "P1-vep/annotated.vcf", "P1_scores.txt"]
+            )
+        with open(self.output_dir.joinpath("raw_results_index.jsonl")) as index_file:
+            self.assertEqual(
+                json.loads(index_file.readline()),
+                {
+                    "sample_id": "P1",
+                    "raw_result": "P1_integrated.csv.zst",
+                    "archive": "P1_outputs.tar.gz",
+                },
+            )
+        self.assertEqual(
+            read_raw_result(raw_result_path).rows(),
+            read_raw_result(self.output_dir.joinpath("P10_integrated.csv")).rows(),
+        )
+
+    def test_find_raw_results(self):
+        self.assertEqual(set(find_raw_results(self.output_dir)), {"P1", "P10"})
+        index_raw_results(self.output_dir)
+        self.output_dir.joinpath("P2_integrated.csv").write_text(RAW_RESULT)
+        apply_retention_policy("P1", self.output_dir, RetentionPolicy(compress=True))
+        self.assertEqual(
+            find_raw_results(self.output_dir),
+            {
+                "P1": self.output_dir.joinpath("P1_integrated.csv.zst"),
+                "P10": self.output_dir.joinpath("P10_integrated.csv"),
+            },
+        )
+
+    def test_index_raw_results(self):
+        apply_retention_policy("P1", self.output_dir, RetentionPolicy())
+        index_raw_results(self.output_dir)
+        with open(self.output_dir.joinpath("raw_results_index.jsonl")) as index_file:
+            self.assertEqual([json.loads(line)["sample_id"] for line in index_file], ["P1", "P10"])
+
+
+class TestRetentionPolicy(unittest.TestCase):
+    def test_retention_policy_compress_without_zstandard(self):
+        with patch.dict(sys.modules, {"zstandard": None}):
+            RetentionPolicy(other_outputs="delete")
+            with self.assertRaises(ImportError):
+                RetentionPolicy(compress=True)
@@ -0,0 +1,106 @@
+import unittest
+
+from pheval_ai_marrvel.run.retry_policy import (
+    AttemptOutcome,
+    FailureType,
+    ResourceRequest,
+    RetryPolicy,
+    SampleTask,
+    classify_failure,
+    run_with_retries,
+)
+from pheval_ai_marrvel.run.run import run_batch_command
+
+
+class TestClassifyFailure(unittest.TestCase):
+    def test_classify_failure_success(self):
+        self.assertIsNone(classify_failure(AttemptOutcome(exit_code=0)))
+
+    def test_classify_failure_oom(self):
+        self.assertEqual(classify_failure(AttemptOutcome(exit_code=137)), FailureType.OOM)
+
+    def test_classify_failure_oom_reported(self):
+        self.assertEqual(
+            classify_failure(AttemptOutcome(exit_code=1, oom_reported=True)), FailureType.OOM
+        )
+
+    def test_classify_failure_timeout(self):
+        self.assertEqual(
+            classify_failure(AttemptOutcome(exit_code=None, timed_out=True)), FailureType.TIMEOUT
+        )
+
+    def test_classify_failure_transient(self):
+        self.assertEqual(
+            classify_failure(
+                AttemptOutcome(exit_code=1, output_tail=["FATAL: toomanyrequests: rate limit"])
+            ),
+            FailureType.TRANSIENT,
+        )
+
+    def test_classify_failure_pipeline(self):
+        self.assertEqual(classify_failure(AttemptOutcome(exit_code=1)), FailureType.PIPELINE)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_escalate(self):
+        self.assertEqual(
+            RetryPolicy(max_memory_gb=100).escalate(ResourceRequest(memory_gb=60)),
+            ResourceRequest(memory_gb=100),
+        )
+
+    def test_escalate_unset_memory(self):
+        self.assertEqual(
+            RetryPolicy(oom_memory_gb=64).escalate(ResourceRequest()),
+            ResourceRequest(memory_gb=64),
+        )
+
+
+class TestRunWithRetries(unittest.TestCase):
+    def test_run_with_retries(self):
+        outcomes = {
+            "oom": [AttemptOutcome(exit_code=137), AttemptOutcome(exit_code=0)],
+            "pipeline": [AttemptOutcome(exit_code=1)],
+            "transient": [AttemptOutcome(exit_code=None, transient_error=True)] * 3,
+        }
+        tasks = [
+            SampleTask(
+                sample_id=sample_id,
+                execute=lambda resources, timeout, sample_outcomes=sample_outcomes: (
+                    sample_outcomes.pop(0)
+                ),
+                resources=ResourceRequest(memory_gb=30),
+            )
+            for sample_id, sample_outcomes in outcomes.items()
+        ]
+        histories = {
+            history.sample_id: history
+            for history in run_with_retries(tasks, RetryPolicy(max_retries=2, backoff=0))
+        }
+        self.assertEqual(histories["oom"].status, "succeeded")
+        self.assertEqual(histories["oom"].attempts[1].resources, ResourceRequest(memory_gb=60))
+        self.assertEqual(histories["pipeline"].status, "failed_pipeline")
+        self.assertEqual(len(histories["pipeline"].attempts), 1)
+        self.assertEqual(histories["transient"].status, "failed_infrastructure")
+        self.assertEqual(len(histories["transient"].attempts), 3)
+
+
+class TestRunBatchCommand(unittest.TestCase):
+    def test_run_batch_command(self):
+        outcome = run_batch_command("echo done; exit 3")
+        self.assertEqual(outcome.exit_code, 3)
+        self.assertEqual(outcome.output_tail, ["done"])
+
+    def test_run_batch_command_timeout(self):
+        self.assertTrue(run_batch_command("sleep 10", timeout=0.2).timed_out)
+
+    def test_run_batch_command_nextflow_oom(self):
+        outcome = run_batch_command(
+            "echo \"ERROR ~ Error executing process > 'PHRANK (1)'\"; "
+            "echo 'Caused by:'; "
+            "echo '  Process `PHRANK (1)` terminated with an error exit status (137)'; "
+            "echo 'Command executed:'; "
+            'for i in $(seq 100); do echo "  command output $i"; done; '
+            "exit 1"
+        )
+        self.assertEqual(len(outcome.output_tail), 50)
+        self.assertEqual(classify_failure(outcome), FailureType.OOM)
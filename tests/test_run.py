@@ -0,0 +1,57 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from pheval_ai_marrvel.benchmark.benchmark import create_synthetic_corpus, stand_in_environment
+from pheval_ai_marrvel.benchmark.stand_in import StandInProfile
+from pheval_ai_marrvel.run.run import run_commands
+
+
+class TestRunCommands(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.run_dir = Path(self.tmp_dir.name)
+        self.testdata_dir = self.run_dir.joinpath("corpus")
+        create_synthetic_corpus(self.testdata_dir, 2, variants=20)
+        self.output_dir = self.run_dir.joinpath("out")
+        self.tool_input_commands_dir = self.run_dir.joinpath("commands")
+        self.output_dir.mkdir()
+        self.tool_input_commands_dir.mkdir()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def run_commands(self) -> None:
+        with stand_in_environment(self.run_dir.joinpath("bin"), StandInProfile(log_lines=0)):
+            run_commands(
+                self.tool_input_commands_dir,
+                self.testdata_dir,
+                self.run_dir,
+                self.output_dir,
+                "apptainer",
+            )
+
+    def test_run_commands_insufficient_disk_space(self):
+        with patch(
+            "pheval_ai_marrvel.validate.validate_inputs.obtain_free_disk_space", return_value=0
+        ):
+            with self.assertRaises(OSError):
+                self.run_commands()
+
+    def test_run_commands_resumed_insufficient_disk_space(self):
+        self.run_commands()
+        with patch(
+            "pheval_ai_marrvel.validate.validate_inputs.obtain_free_disk_space", return_value=0
+        ):
+            self.run_commands()
+
+    def test_run_commands_resumed_run_report(self):
+        self.run_commands()
+        self.run_commands()
+        with open(self.tool_input_commands_dir.joinpath("corpus_run_report.json")) as report_file:
+            run_report = json.load(report_file)
+        self.assertEqual(run_report["total_samples"], 2)
+        self.assertEqual(run_report["succeeded"], 2)
+        self.assertTrue(all(sample["attempts"] for sample in run_report["samples"]))
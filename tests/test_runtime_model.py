@@ -0,0 +1,68 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from pheval_ai_marrvel.plan.runtime_model import (
+    DEFAULT_SAMPLE_RUNTIME,
+    RuntimeModel,
+    calibrate_runtime_model,
+    estimate_wall_time,
+)
+
+
+class TestCalibrateRuntimeModel(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.run_report_path = Path(self.tmp_dir.name).joinpath("corpus_run_report.json")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_run_report(self, samples):
+        with open(self.run_report_path, "w") as run_report_file:
+            json.dump({"samples": samples}, run_report_file)
+
+    def test_calibrate_runtime_model(self):
+        self.write_run_report(
+            [
+                {"vcf_size": 1000, "status": "succeeded", "attempts": [{"duration": 110.0}]},
+                {"vcf_size": 3000, "status": "succeeded", "attempts": [{"duration": 310.0}]},
+                {"vcf_size": 9000, "status": "failed_pipeline", "attempts": [{"duration": 5.0}]},
+            ]
+        )
+        runtime_model = calibrate_runtime_model([self.run_report_path])
+        self.assertEqual(runtime_model.calibration_samples, 2)
+        self.assertAlmostEqual(runtime_model.intercept, 10.0)
+        self.assertAlmostEqual(runtime_model.seconds_per_byte, 0.1)
+        self.assertAlmostEqual(runtime_model.estimate(2000), 210.0)
+
+    def test_calibrate_runtime_model_negative_slope(self):
+        self.write_run_report(
+            [
+                {"vcf_size": 1000, "status": "succeeded", "attempts": [{"duration": 300.0}]},
+                {"vcf_size": 3000, "status": "succeeded", "attempts": [{"duration": 100.0}]},
+            ]
+        )
+        runtime_model = calibrate_runtime_model([self.run_report_path])
+        self.assertEqual(
+            runtime_model,
+            RuntimeModel(intercept=200.0, seconds_per_byte=0.0, calibration_samples=2),
+        )
+        self.assertAlmostEqual(runtime_model.estimate(10**9), 200.0)
+
+    def test_calibrate_runtime_model_no_history(self):
+        self.assertEqual(
+            calibrate_runtime_model([]), RuntimeModel(intercept=DEFAULT_SAMPLE_RUNTIME)
+        )
+
+
+class TestEstimateWallTime(unittest.TestCase):
+    def test_estimate_wall_time(self):
+        self.assertEqual(estimate_wall_time([4.0, 3.0, 3.0, 2.0], 2), 6.0)
+
+    def test_estimate_wall_time_serial(self):
+        self.assertEqual(estimate_wall_time([5.0, 4.0], 1), 9.0)
+
+    def test_estimate_wall_time_no_samples(self):
+        self.assertEqual(estimate_wall_time([], 4), 0.0)
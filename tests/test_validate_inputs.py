@@ -0,0 +1,112 @@
+import gzip
+import struct
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from pheval_ai_marrvel.benchmark.benchmark import create_synthetic_corpus
+from pheval_ai_marrvel.validate.validate import validate
+from pheval_ai_marrvel.validate.validate_inputs import (
+    BGZF_EOF,
+    check_bgzip_integrity,
+    check_hpo_ids,
+)
+
+VCF_CONTENTS = b"##fileformat=VCFv4.2\n#CHROM\tPOS\tID\tREF\tALT\n1\t100\t.\tA\tG\n"
+
+
+def bgzip_block(data: bytes) -> bytes:
+    compressor = zlib.compressobj(wbits=-15)
+    compressed = compressor.compress(data) + compressor.flush()
+    return (
+        b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00"
+        + struct.pack("<H", len(compressed) + 25)
+        + compressed
+        + struct.pack("<II", zlib.crc32(data), len(data))
+    )
+
+
+class TestCheckBgzipIntegrity(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.vcf_path = Path(self.tmp_dir.name).joinpath("sample.vcf.gz")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_check_bgzip_integrity(self):
+        self.vcf_path.write_bytes(bgzip_block(VCF_CONTENTS) + BGZF_EOF)
+        self.assertEqual(check_bgzip_integrity(self.vcf_path), [])
+
+    def test_check_bgzip_integrity_truncated(self):
+        self.vcf_path.write_bytes(bgzip_block(VCF_CONTENTS))
+        self.assertEqual(check_bgzip_integrity(self.vcf_path), [f"{self.vcf_path} is truncated."])
+
+    def test_check_bgzip_integrity_gzip(self):
+        self.vcf_path.write_bytes(gzip.compress(VCF_CONTENTS))
+        self.assertEqual(
+            check_bgzip_integrity(self.vcf_path), [f"{self.vcf_path} is not bgzip compressed."]
+        )
+
+    def test_check_bgzip_integrity_uncompressed(self):
+        self.vcf_path.write_bytes(VCF_CONTENTS)
+        self.assertEqual(
+            check_bgzip_integrity(self.vcf_path), [f"{self.vcf_path} is not gzip compressed."]
+        )
+
+    def test_check_bgzip_integrity_missing_header(self):
+        self.vcf_path.write_bytes(bgzip_block(b"1\t100\t.\tA\tG\n") + BGZF_EOF)
+        self.assertEqual(
+            check_bgzip_integrity(self.vcf_path),
+            [f"{self.vcf_path} is missing the ##fileformat VCF header line."],
+        )
+
+
+class TestCheckHpoIds(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.hpo_txt_path = Path(self.tmp_dir.name).joinpath("sample.txt")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_check_hpo_ids(self):
+        self.hpo_txt_path.write_text("HP:0001250\nHP:0001263")
+        self.assertIsNone(check_hpo_ids(self.hpo_txt_path))
+
+    def test_check_hpo_ids_empty(self):
+        self.hpo_txt_path.write_text("")
+        self.assertEqual(
+            check_hpo_ids(self.hpo_txt_path), f"{self.hpo_txt_path} does not contain any HPO ids."
+        )
+
+    def test_check_hpo_ids_missing(self):
+        self.assertEqual(check_hpo_ids(self.hpo_txt_path), f"{self.hpo_txt_path} does not exist.")
+
+
+class TestValidate(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.testdata_dir = Path(self.tmp_dir.name).joinpath("corpus")
+        create_synthetic_corpus(self.testdata_dir, 2, variants=20)
+        self.arguments = [
+            "-t",
+            str(self.testdata_dir),
+            "-o",
+            self.tmp_dir.name,
+            "-r",
+            str(Path(self.tmp_dir.name).joinpath("validation_report.json")),
+        ]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_validate(self):
+        self.assertEqual(CliRunner().invoke(validate, self.arguments).exit_code, 0)
+
+    def test_validate_invalid_sample(self):
+        self.testdata_dir.joinpath("hpo_ids/sample_00000.txt").write_text("")
+        self.assertEqual(CliRunner().invoke(validate, self.arguments).exit_code, 1)